@@ -0,0 +1,49 @@
+"""Scenes per second for solo worlds versus multi-tower batches (single core).
+
+Usage: PYTHONPATH=src python benchmarks/bench_batch.py --n-scenes 64 --batch-sizes 1 8 32
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List
+
+import typer
+
+from data_gen.pybullet_worlds import SettleConfig, TowerWorld, generate_scene, generate_scene_batch
+
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    n_scenes: int = typer.Option(64, help="Scenes per configuration"),
+    batch_sizes: List[int] = typer.Option([1, 4, 16, 32], help="Towers per physics world"),
+    num_blocks: int = typer.Option(4, help="Blocks per tower"),
+) -> None:
+    seeds = list(range(n_scenes))
+    stables = [s % 2 == 0 for s in seeds]
+    typer.echo(f"{'settle':>9} {'batch':>6} {'scenes/s':>9}")
+    for label, settle in (("fixed", None), ("adaptive", SettleConfig())):
+        for size in batch_sizes:
+            with TowerWorld() as world:
+                start = time.perf_counter()
+                if size == 1:
+                    for seed, stable in zip(seeds, stables):
+                        generate_scene(seed=seed, stable=stable, num_blocks=num_blocks, world=world, settle=settle)
+                else:
+                    for i in range(0, n_scenes, size):
+                        generate_scene_batch(
+                            seeds[i : i + size],
+                            stables[i : i + size],
+                            num_blocks=num_blocks,
+                            world=world,
+                            settle=settle,
+                        )
+                elapsed = time.perf_counter() - start
+            typer.echo(f"{label:>9} {size:>6} {n_scenes / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,127 @@
+"""Benchmark constraints_from_scene against the previous pure-Python derivation.
+
+Usage: PYTHONPATH=src python benchmarks/bench_constraints.py --heights 4 50 200 500
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+import numpy as np
+import typer
+
+from data_gen.constraints import _support_relationships, constraints_from_scene
+from data_gen.pybullet_worlds import BlockSpec, ObjectState, SceneSample
+from data_gen.scene_graph import scene_graph
+
+
+app = typer.Typer(add_completion=False)
+
+
+def _legacy_constraints_from_scene(scene: SceneSample) -> Dict[str, object]:
+    # Verbatim copy of the list-scanning implementation, kept as the reference.
+    graph = scene_graph(scene)
+    supports = _support_relationships(scene)
+    com_constraints: Dict[str, Dict[str, object]] = {}
+    for obj in graph["objects"]:
+        supporters = supports.get(obj["name"], [])
+        proj = (obj["com"][0], obj["com"][1])
+        polygons = []
+        for support_name in supporters:
+            support_obj = next(o for o in graph["objects"] if o["name"] == support_name)
+            polygons.append(support_obj["support_polygon_xy"])
+        if polygons:
+            within_all = True
+            for poly in polygons:
+                xs, ys = zip(*poly)
+                if not (min(xs) <= proj[0] <= max(xs) and min(ys) <= proj[1] <= max(ys)):
+                    within_all = False
+                    break
+        else:
+            within_all = False
+        com_constraints[obj["name"]] = {
+            "com_xy": proj,
+            "supporters": supporters,
+            "within_support": within_all,
+            "support_polygons": polygons,
+        }
+    assumptions: List[str] = []
+    for contact in scene.contacts:
+        assumptions.append(f"contact({contact['body_a']},{contact['body_b']})")
+    for obj, sups in supports.items():
+        for supporter in sups:
+            assumptions.append(f"support({obj},{supporter})")
+    for obj, info in com_constraints.items():
+        if info["supporters"]:
+            assumptions.append(f"com_within_support({obj})")
+    return {
+        "assumptions": sorted(set(assumptions)),
+        "claims": ["stable(scene)" if scene.stable else "unstable(scene)"],
+        "com_constraints": com_constraints,
+        "supports": supports,
+        "label": {"possible": scene.stable},
+    }
+
+
+def synthetic_tower(num_blocks: int, seed: int = 0, points_per_contact: int = 4) -> SceneSample:
+    """A settled-looking tower with ``points_per_contact`` contact points between neighbours."""
+    rng = np.random.default_rng(seed)
+    objects: List[ObjectState] = []
+    z = 0.0
+    for i in range(num_blocks):
+        half = tuple(float(v) for v in rng.uniform(0.05, 0.15, size=3))
+        offset = rng.normal(0.0, 0.03, size=2)
+        z += half[2]
+        position = (float(offset[0]), float(offset[1]), z)
+        objects.append(
+            ObjectState(
+                name=f"block_{i}",
+                block=BlockSpec(name=f"block_{i}", half_extents=half, mass=1.0),  # type: ignore[arg-type]
+                position=position,
+                orientation=(0.0, 0.0, 0.0, 1.0),
+                linear_velocity=(0.0, 0.0, 0.0),
+                angular_velocity=(0.0, 0.0, 0.0),
+                aabb_min=(position[0] - half[0], position[1] - half[1], z - half[2]),
+                aabb_max=(position[0] + half[0], position[1] + half[1], z + half[2]),
+            )
+        )
+        z += half[2]
+    contacts = [
+        {
+            "body_a": f"block_{i}",
+            "body_b": f"block_{i - 1}",
+            "position_on_a": (0.0, 0.0, 0.0),
+            "position_on_b": (0.0, 0.0, 0.0),
+            "normal": (0.0, 0.0, 1.0),
+            "normal_force": 1.0,
+        }
+        for i in range(1, num_blocks)
+        for _ in range(points_per_contact)
+    ]
+    return SceneSample(objects=objects, contacts=contacts, stable=True, seed=seed)
+
+
+def _time(fn, scene: SceneSample, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(scene)
+    return (time.perf_counter() - start) / repeats
+
+
+@app.command()
+def main(
+    heights: List[int] = typer.Option([4, 20, 50, 100, 200, 500], help="Tower heights to benchmark"),
+    repeats: int = typer.Option(20, help="Repetitions per height"),
+) -> None:
+    typer.echo(f"{'blocks':>7} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for height in heights:
+        scene = synthetic_tower(height)
+        assert constraints_from_scene(scene) == _legacy_constraints_from_scene(scene)
+        legacy = _time(_legacy_constraints_from_scene, scene, repeats)
+        current = _time(constraints_from_scene, scene, repeats)
+        typer.echo(f"{height:>7} {legacy * 1e3:>10.3f} {current * 1e3:>11.3f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,80 @@
+"""Compare pairwise contact queries with the single-sweep collect_contacts.
+
+Usage: PYTHONPATH=src python benchmarks/bench_contacts.py --heights 4 20 50 100
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+import numpy as np
+import pybullet as p
+import typer
+
+from data_gen.pybullet_worlds import (
+    TowerWorld,
+    _generate_stack_layout,
+    collect_contacts,
+    random_block_specs,
+    settle_simulation,
+)
+
+
+app = typer.Typer(add_completion=False)
+
+
+def _pairwise_contacts(client: int, id_to_name: Dict[int, str]) -> List[Dict[str, object]]:
+    # The previous O(n^2) implementation, without ground contacts.
+    contacts: List[Dict[str, object]] = []
+    ids = list(id_to_name.keys())
+    for idx_a, body_a in enumerate(ids):
+        for body_b in ids[idx_a + 1 :]:
+            for cp in p.getContactPoints(bodyA=body_a, bodyB=body_b, physicsClientId=client):
+                contacts.append(
+                    {
+                        "body_a": id_to_name[body_a],
+                        "body_b": id_to_name[body_b],
+                        "position_on_a": cp[5],
+                        "position_on_b": cp[6],
+                        "normal": cp[7],
+                        "normal_force": cp[9],
+                    }
+                )
+    return contacts
+
+
+@app.command()
+def main(
+    heights: List[int] = typer.Option([4, 20, 50, 100, 200], help="Tower heights to benchmark"),
+    repeats: int = typer.Option(20, help="Repetitions per height"),
+) -> None:
+    typer.echo(f"{'blocks':>7} {'pairwise ms':>12} {'sweep ms':>9} {'speedup':>8} {'ground pts':>11}")
+    with TowerWorld() as world:
+        for height in heights:
+            rng = np.random.default_rng(height)
+            specs = random_block_specs(height, rng)
+            poses = _generate_stack_layout(specs, stable=True, rng=rng)
+            id_to_name = {world.spawn_block(spec, pose): spec.name for spec, pose in zip(specs, poses)}
+            settle_simulation(world.client, steps=5)
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                pairwise = _pairwise_contacts(world.client, id_to_name)
+            pairwise_t = (time.perf_counter() - start) / repeats
+            start = time.perf_counter()
+            for _ in range(repeats):
+                sweep = collect_contacts(world.client, id_to_name, ground_id=world.plane_id)
+            sweep_t = (time.perf_counter() - start) / repeats
+
+            ground = sum(1 for c in sweep if c["body_b"] == "ground")
+            assert len(sweep) - ground == len(pairwise)
+            typer.echo(
+                f"{height:>7} {pairwise_t * 1e3:>12.3f} {sweep_t * 1e3:>9.3f} "
+                f"{pairwise_t / sweep_t:>7.1f}x {ground:>11}"
+            )
+            world.clear()
+
+
+if __name__ == "__main__":
+    app()
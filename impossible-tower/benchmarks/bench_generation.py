@@ -0,0 +1,113 @@
+"""Per-stage generation cost as towers grow taller.
+
+Each stage mirrors what ``generate_scene`` and ``make_dataset._write_sample`` do
+for one scene: spawn, settle, contact/state collection, rendering, scene-graph
+and constraint derivation, and serialization (JSON plus image files).
+
+Usage: PYTHONPATH=src python benchmarks/bench_generation.py --block-counts 4 20 50 100 200
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import typer
+
+from data_gen.constraints import constraints_from_scene
+from data_gen.pybullet_worlds import (
+    SceneSample,
+    SettleConfig,
+    TowerWorld,
+    _generate_stack_layout,
+    _object_states,
+    collect_contacts,
+    random_block_specs,
+    settle_simulation,
+)
+from data_gen.render import RenderConfig, capture_views, save_camera_config, save_views
+from data_gen.scene_graph import scene_graph
+
+
+app = typer.Typer(add_completion=False)
+
+STAGES = ("spawn", "settle", "contacts", "render", "derive", "serialize")
+
+
+def _time_scene(
+    world: TowerWorld,
+    seed: int,
+    num_blocks: int,
+    settle: Optional[SettleConfig],
+    cfg: RenderConfig,
+    out: pathlib.Path,
+) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    rng = np.random.default_rng(seed)
+    specs = random_block_specs(num_blocks=num_blocks, rng=rng)
+    poses = _generate_stack_layout(specs=specs, stable=seed % 2 == 0, rng=rng)
+
+    start = time.perf_counter()
+    body_ids = [world.spawn_block(spec, pose) for spec, pose in zip(specs, poses)]
+    timings["spawn"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    settle_simulation(world.client, body_ids=body_ids, config=settle)
+    timings["settle"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    objects = _object_states(world.client, specs, body_ids)
+    id_to_name = {body_id: spec.name for spec, body_id in zip(specs, body_ids)}
+    contacts = collect_contacts(world.client, id_to_name, ground_id=world.plane_id)
+    timings["contacts"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    images = capture_views(world.client, cfg)
+    timings["render"] = time.perf_counter() - start
+    world.clear()
+
+    scene = SceneSample(objects=objects, contacts=contacts, stable=seed % 2 == 0, seed=seed)
+    start = time.perf_counter()
+    graph = scene_graph(scene)
+    constraints = constraints_from_scene(scene)
+    timings["derive"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_views(images, out / "images")
+    save_camera_config(cfg, out)
+    (out / "scene_graph.json").write_text(json.dumps(graph, indent=2))
+    (out / "constraints.json").write_text(json.dumps(constraints, indent=2))
+    (out / "label.json").write_text(json.dumps({"possible": scene.stable}, indent=2))
+    timings["serialize"] = time.perf_counter() - start
+    return timings
+
+
+@app.command()
+def main(
+    block_counts: List[int] = typer.Option([4, 20, 50, 100, 200], help="Blocks per tower"),
+    n_scenes: int = typer.Option(5, help="Scenes per block count"),
+    views: int = typer.Option(4, help="Camera views rendered per scene"),
+    adaptive_settle: bool = typer.Option(True, help="Settle with SettleConfig early exit"),
+) -> None:
+    default_cfg = RenderConfig()
+    cfg = RenderConfig(camera_poses=default_cfg.camera_poses[:views])
+    settle = SettleConfig() if adaptive_settle else None
+    typer.echo(f"{'blocks':>6} " + " ".join(f"{stage:>9}" for stage in STAGES) + f" {'total':>9}   (median ms/scene)")
+    with TowerWorld() as world, tempfile.TemporaryDirectory() as tmp:
+        for num_blocks in block_counts:
+            samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+            for seed in range(n_scenes):
+                out = pathlib.Path(tmp) / f"{num_blocks}_{seed}"
+                out.mkdir()
+                for stage, seconds in _time_scene(world, seed, num_blocks, settle, cfg, out).items():
+                    samples[stage].append(seconds)
+            medians = [float(np.median(samples[stage])) * 1e3 for stage in STAGES]
+            typer.echo(f"{num_blocks:>6} " + " ".join(f"{ms:>9.1f}" for ms in medians) + f" {sum(medians):>9.1f}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,53 @@
+"""Time camera capture across render modes and resolutions.
+
+Usage: PYTHONPATH=src python benchmarks/bench_render.py --sizes 320 640 1024
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from typing import Dict, List
+
+import typer
+
+from data_gen.pybullet_worlds import TowerWorld, generate_scene
+from data_gen.render import RenderConfig, capture_views, _respawn_static_scene
+
+
+app = typer.Typer(add_completion=False)
+
+MODES: Dict[str, Dict[str, bool]] = {
+    # "legacy" mirrors the previous behaviour: shadows on and a segmentation pass whose output was discarded.
+    "legacy": {"shadows": True, "save_segmentation": True},
+    "rgb+shadows": {"shadows": True},
+    "rgb": {"shadows": False},
+    "rgb+depth+seg": {"shadows": False, "save_depth": True, "save_segmentation": True},
+}
+
+
+@app.command()
+def main(
+    sizes: List[int] = typer.Option([320, 640, 1024], help="Square image sizes to benchmark"),
+    n_scenes: int = typer.Option(10, help="Scenes rendered per mode and size"),
+) -> None:
+    scenes = [generate_scene(seed=s, stable=s % 2 == 0) for s in range(n_scenes)]
+    typer.echo(f"{'size':>6} {'mode':>14} {'ms/scene':>10}")
+    with TowerWorld() as world:
+        for size in sizes:
+            for mode, overrides in MODES.items():
+                base = RenderConfig(width=size, height=size, **overrides)
+                elapsed = 0.0
+                for scene in scenes:
+                    # Legacy mode rebuilds the matrices per scene, as render_views used to.
+                    cfg = dataclasses.replace(base) if mode == "legacy" else base
+                    _respawn_static_scene(scene, world)
+                    start = time.perf_counter()
+                    capture_views(world.client, cfg)
+                    elapsed += time.perf_counter() - start
+                    world.clear()
+                typer.echo(f"{size:>6} {mode:>14} {elapsed / n_scenes * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,74 @@
+"""Compare fixed-step and early-exit settling on a reference seed set.
+
+Usage: PYTHONPATH=src python benchmarks/bench_settle.py --n-seeds 200
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+import numpy as np
+import typer
+
+from data_gen.constraints import constraints_from_scene
+from data_gen.pybullet_worlds import (
+    SceneSample,
+    SettleConfig,
+    TowerWorld,
+    _generate_stack_layout,
+    generate_scene,
+    random_block_specs,
+)
+
+
+app = typer.Typer(add_completion=False)
+
+
+def _toppled(scene: SceneSample, threshold: float) -> bool:
+    # Replays the generator's RNG draws (stable is passed explicitly) to recover spawn poses.
+    rng = np.random.default_rng(scene.seed)
+    specs = random_block_specs(len(scene.objects), rng)
+    spawn = np.array([pose[0] for pose in _generate_stack_layout(specs, scene.stable, rng)])
+    final = np.array([obj.position for obj in scene.objects])
+    return bool(np.linalg.norm(final - spawn, axis=1).max() > threshold)
+
+
+def _within_support(scene: SceneSample) -> Dict[str, bool]:
+    return {k: v["within_support"] for k, v in constraints_from_scene(scene)["com_constraints"].items()}
+
+
+@app.command()
+def main(
+    n_seeds: int = typer.Option(100, help="Number of reference seeds"),
+    num_blocks: int = typer.Option(4, help="Blocks per tower"),
+) -> None:
+    settle = SettleConfig()
+    timings: Dict[str, float] = {}
+    runs: Dict[str, List[SceneSample]] = {}
+    with TowerWorld() as world:
+        for mode, cfg in (("fixed", None), ("adaptive", settle)):
+            start = time.perf_counter()
+            runs[mode] = [
+                generate_scene(seed=s, num_blocks=num_blocks, stable=s % 2 == 0, world=world, settle=cfg)
+                for s in range(n_seeds)
+            ]
+            timings[mode] = time.perf_counter() - start
+
+    pairs = list(zip(runs["fixed"], runs["adaptive"]))
+    threshold = settle.topple_displacement
+    topple_agree = sum(_toppled(a, threshold) == _toppled(b, threshold) for a, b in pairs)
+    rested = [(a, b) for a, b in pairs if not _toppled(b, threshold)]
+    support_agree = sum(_within_support(a) == _within_support(b) for a, b in rested)
+    steps = np.array([s.settle_steps for s in runs["adaptive"]])
+
+    typer.echo(f"seeds={n_seeds} blocks={num_blocks}")
+    for mode, elapsed in timings.items():
+        typer.echo(f"{mode:>8}: {elapsed:.2f}s ({elapsed / n_seeds * 1e3:.2f} ms/scene)")
+    typer.echo(f"adaptive steps: median={int(np.median(steps))} max={int(steps.max())}")
+    typer.echo(f"topple outcome agreement: {topple_agree}/{len(pairs)}")
+    typer.echo(f"within_support agreement (rested scenes): {support_agree}/{len(rested)}")
+
+
+if __name__ == "__main__":
+    app()
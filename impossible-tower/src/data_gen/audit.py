@@ -0,0 +1,98 @@
+"""Audit reduced-fidelity scenes against a reference re-simulation."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .constraints import constraints_from_scene
+from .pybullet_worlds import (
+    REFERENCE_FIDELITY,
+    SceneSample,
+    SettleConfig,
+    TowerWorld,
+    generate_scene,
+)
+
+
+AUDIT_NAME = "fidelity_audit.json"
+
+
+def should_audit(scene_seed: int, audit_frac: float) -> bool:
+    """Deterministic per-scene draw, independent of worker count and batching."""
+    if audit_frac <= 0.0:
+        return False
+    return bool(np.random.default_rng((scene_seed, 0xA0D1)).random() < audit_frac)
+
+
+def _labels(scene: SceneSample, topple_displacement: float) -> Dict[str, object]:
+    com = constraints_from_scene(scene)["com_constraints"]
+    return {
+        "toppled": bool((scene.max_displacement or 0.0) > topple_displacement),
+        "within_support": {name: info["within_support"] for name, info in com.items()},  # type: ignore[union-attr]
+    }
+
+
+def compare_scenes(
+    scene: SceneSample,
+    reference: SceneSample,
+    pose_tol: float = 0.01,
+    topple_displacement: float = SettleConfig.topple_displacement,
+) -> Dict[str, object]:
+    """Compare a scene with its reference re-simulation.
+
+    Labels are the topple outcome (largest block displacement from spawn) and
+    the per-block ``within_support`` flags the constraints are built from. The
+    pose error is the largest settled position difference over all blocks.
+    """
+    ours = np.array([obj.position for obj in scene.objects])
+    theirs = np.array([obj.position for obj in reference.objects])
+    pose_error = float(np.linalg.norm(ours - theirs, axis=1).max())
+    labels = _labels(scene, topple_displacement)
+    reference_labels = _labels(reference, topple_displacement)
+    return {
+        "seed": scene.seed,
+        "stable": scene.stable,
+        "pose_error": pose_error,
+        "pose_mismatch": pose_error > pose_tol,
+        "label_mismatch": labels != reference_labels,
+        "labels": labels,
+        "reference_labels": reference_labels,
+    }
+
+
+def audit_scene(
+    scene: SceneSample,
+    world: Optional[TowerWorld] = None,
+    settle: Optional[SettleConfig] = None,
+    pose_tol: float = 0.01,
+) -> Dict[str, object]:
+    """Re-simulate ``scene`` at reference fidelity and compare the two outcomes."""
+    reference = generate_scene(
+        seed=scene.seed,
+        num_blocks=len(scene.objects),
+        stable=scene.stable,
+        world=world,
+        settle=settle,
+        fidelity=REFERENCE_FIDELITY,
+    )
+    return compare_scenes(scene, reference, pose_tol=pose_tol)
+
+
+def summarize_audit(records: Sequence[Dict[str, object]], fidelity: str, pose_tol: float) -> Dict[str, object]:
+    errors = np.array([record["pose_error"] for record in records], dtype=float)
+    count = len(records)
+    label_mismatches: List[object] = [record["seed"] for record in records if record["label_mismatch"]]
+    pose_mismatches = sum(bool(record["pose_mismatch"]) for record in records)
+    return {
+        "fidelity": fidelity,
+        "audited": count,
+        "pose_tol": pose_tol,
+        "label_disagreement": len(label_mismatches) / count if count else 0.0,
+        "pose_disagreement": pose_mismatches / count if count else 0.0,
+        "pose_error_p50": float(np.percentile(errors, 50)) if count else 0.0,
+        "pose_error_p95": float(np.percentile(errors, 95)) if count else 0.0,
+        "pose_error_max": float(errors.max()) if count else 0.0,
+        "label_mismatch_seeds": label_mismatches,
+    }
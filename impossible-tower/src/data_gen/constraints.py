@@ -6,50 +6,77 @@ import json
 import pathlib
 from typing import Dict, List, Tuple
 
+import numpy as np
 
-from .scene_graph import scene_graph
-from .pybullet_worlds import SceneSample
+from .scene_graph import _support_polygon_xy
+from .pybullet_worlds import GROUND_HALF_EXTENT, GROUND_NAME, SceneSample
 
 
-Vec2 = Tuple[float, float]
+GROUND_POLYGON_XY = [
+    (-GROUND_HALF_EXTENT, -GROUND_HALF_EXTENT),
+    (GROUND_HALF_EXTENT, -GROUND_HALF_EXTENT),
+    (GROUND_HALF_EXTENT, GROUND_HALF_EXTENT),
+    (-GROUND_HALF_EXTENT, GROUND_HALF_EXTENT),
+]
 
 
-def _project_to_support_polygon(com_xy: Vec2, polygon: List[Vec2]) -> bool:
-    xs, ys = zip(*polygon)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    return min_x <= com_xy[0] <= max_x and min_y <= com_xy[1] <= max_y
 
 
 def _support_relationships(scene: SceneSample) -> Dict[str, List[str]]:
-    supports: Dict[str, List[str]] = {}
+    # Contacts hold one entry per contact point; each supporter is listed once, in first-seen order.
+    supports: Dict[str, Dict[str, None]] = {}
     for contact in scene.contacts:
         normal = contact["normal"]
         if normal[2] > 0.5:
-            supports.setdefault(contact["body_a"], []).append(contact["body_b"])
-    return supports
+            supports.setdefault(contact["body_a"], {})[contact["body_b"]] = None  # type: ignore[index]
+    return {obj: list(supporters) for obj, supporters in supports.items()}
+
+
+def _within_support(
+    scene: SceneSample,
+    index: Dict[str, int],
+    supports: Dict[str, List[str]],
+) -> np.ndarray:
+    """CoM-in-support-rectangle test for every (object, supporter) pair at once.
+
+    An object passes when its CoM lies inside all of its supporters' rectangles;
+    objects without supporters fail. The ground is an extra row after the objects.
+    """
+    n = len(scene.objects)
+    centers = np.array([obj.position[:2] for obj in scene.objects], dtype=float).reshape(n, 2)
+    half = np.array([obj.block.half_extents[:2] for obj in scene.objects], dtype=float).reshape(n, 2)
+    lower = np.vstack([centers - half, [-GROUND_HALF_EXTENT, -GROUND_HALF_EXTENT]])
+    upper = np.vstack([centers + half, [GROUND_HALF_EXTENT, GROUND_HALF_EXTENT]])
+
+    obj_idx = np.array([index[name] for name, sups in supports.items() for _ in sups], dtype=np.intp)
+    sup_idx = np.array([index[sup] for sups in supports.values() for sup in sups], dtype=np.intp)
+    com = centers[obj_idx]
+    inside = np.all((lower[sup_idx] <= com) & (com <= upper[sup_idx]), axis=1)
+
+    has_support = np.bincount(obj_idx, minlength=n) > 0
+    misses = np.bincount(obj_idx[~inside], minlength=n)
+    return has_support & (misses == 0)
 
 
 def constraints_from_scene(scene: SceneSample) -> Dict[str, object]:
-    graph = scene_graph(scene)
     supports = _support_relationships(scene)
+    index = {obj.name: i for i, obj in enumerate(scene.objects)}
+    index[GROUND_NAME] = len(scene.objects)
+    within = _within_support(scene, index, supports)
+    polygon_cache: Dict[str, List[Tuple[float, float]]] = {GROUND_NAME: GROUND_POLYGON_XY}
 
     com_constraints: Dict[str, Dict[str, object]] = {}
-    for obj in graph["objects"]:
-        supporters = supports.get(obj["name"], [])
-        proj = (obj["com"][0], obj["com"][1])
+    for i, obj in enumerate(scene.objects):
+        supporters = supports.get(obj.name, [])
         polygons = []
         for support_name in supporters:
-            support_obj = next(o for o in graph["objects"] if o["name"] == support_name)
-            polygons.append(support_obj["support_polygon_xy"])
-        if polygons:
-            within_all = all(_project_to_support_polygon(proj, poly) for poly in polygons)
-        else:
-            within_all = False
-        com_constraints[obj["name"]] = {
-            "com_xy": proj,
+            if support_name not in polygon_cache:
+                polygon_cache[support_name] = _support_polygon_xy(scene.objects[index[support_name]])
+            polygons.append(polygon_cache[support_name])
+        com_constraints[obj.name] = {
+            "com_xy": (obj.position[0], obj.position[1]),
             "supporters": supporters,
-            "within_support": within_all,
+            "within_support": bool(within[i]),
             "support_polygons": polygons,
         }
 
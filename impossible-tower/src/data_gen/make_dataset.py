@@ -3,53 +3,341 @@
 from __future__ import annotations
 
 import json
+import os
 import pathlib
 import numpy as np
+import shutil
 import tempfile
-from typing import Optional
+from dataclasses import asdict, dataclass, fields
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
 import typer
 from google.cloud import storage
 
+from .audit import AUDIT_NAME, audit_scene, should_audit, summarize_audit
+from .manifest import DatasetManifest, ManifestError
 from .constraints import constraints_from_scene, write_constraints
-from .pybullet_worlds import SceneSample, generate_scene
-from .render import RenderConfig, render_views, save_camera_config, save_views
+from .pybullet_worlds import (
+    FIDELITY_PROFILES,
+    SceneSample,
+    SettleConfig,
+    TowerWorld,
+    fidelity_profile,
+    generate_scene,
+    generate_scene_batch,
+)
+from .render import IMAGE_FORMATS, ImageEncoding, ImageSink, RenderConfig, render_views, save_camera_config
 from .scene_graph import scene_graph, write_scene_graph
+from .shards import INDEX_NAME, ShardWriter
+from .upload import StreamingUploader, UploadError
 
 
 app = typer.Typer(add_completion=False)
 
+OUTPUT_FORMATS = ("dir", "shards")
+
+_WORLD: Optional[TowerWorld] = None
+_SINK: Optional[ImageSink] = None
+
+# Batched towers sit on a grid that must stay on the ground plane, so their
+# spacing (twice the tallest possible tower) caps the block count.
+MAX_BATCH_BLOCKS = 20
+MAX_BLOCK_HEIGHT = 0.3
+
 
 def _is_gcs_path(path: str) -> bool:
     return path.startswith("gs://")
 
 
 
-def _upload_directory(local_dir: pathlib.Path, gcs_uri: str) -> None:
+def _gcs_bucket(gcs_uri: str) -> Tuple[Any, str]:
     if not _is_gcs_path(gcs_uri):
         raise ValueError("gcs_uri must start with gs://")
     bucket_name, _, prefix = gcs_uri[5:].partition("/")
     client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    for path in local_dir.rglob("*"):
-        if path.is_dir():
-            continue
-        dest_path = f"{prefix}/{path.relative_to(local_dir)}".strip("/")
-        blob = bucket.blob(dest_path)
-        blob.upload_from_filename(path.as_posix())
+    return client.bucket(bucket_name), prefix
+
+
+def _finish_upload(uploader: StreamingUploader) -> None:
+    try:
+        uploader.close()
+    except UploadError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1) from exc
+
+
+def _worker_world() -> TowerWorld:
+    # One persistent client per process, shared by simulation and rendering.
+    global _WORLD
+    if _WORLD is None:
+        _WORLD = TowerWorld()
+    return _WORLD
+
+
+def _forget_sink() -> None:
+    # A forked worker inherits the parent's sink object but none of its threads.
+    global _SINK
+    _SINK = None
+
+
+os.register_at_fork(after_in_child=_forget_sink)
+
+
+def _worker_sink(encoding: ImageEncoding, workers: int) -> ImageSink:
+    # Encoder threads also persist per process; a new encoding replaces the pool.
+    global _SINK
+    if _SINK is None or _SINK.encoding != encoding or _SINK.workers != workers:
+        if _SINK is not None:
+            _SINK.close()
+        _SINK = ImageSink(encoding, workers=workers)
+    return _SINK
 
 
 def _write_sample(  # type: ignore[override]
     sample_dir: pathlib.Path,
     scene: SceneSample,
     render_cfg: RenderConfig,
-) -> None:
-    images = render_views(scene, render_cfg)
-    save_views(images, sample_dir / "images")
+    sink: ImageSink,
+    world: Optional[TowerWorld] = None,
+) -> List[Future]:
+    """Write a sample's metadata and queue its views on ``sink``; the views are
+    complete once every returned future has finished."""
+    images = scene.images if scene.images is not None else render_views(scene, render_cfg, world=world)
+    pending = sink.submit(images, sample_dir / "images")
     save_camera_config(render_cfg, sample_dir)
     write_scene_graph(scene, sample_dir / "scene_graph.json")
     write_constraints(scene, sample_dir / "constraints.json")
     (sample_dir / "label.json").write_text(json.dumps({"possible": scene.stable}, indent=2))
+    return pending
+
+
+SceneTask = Tuple[int, int, bool, int]
+
+
+@dataclass
+class GenerationOptions:
+    """Per-scene generation settings shipped to every worker."""
+
+    settle: Optional[SettleConfig] = None
+    batch_size: int = 1
+    fidelity: str = "reference"
+    num_blocks: Tuple[int, int] = (4, 4)
+    image_encoding: ImageEncoding = ImageEncoding()
+
+
+AUDIT_POSE_TOL = 0.01
+AuditRecord = Dict[str, object]
+
+
+def _parse_num_blocks(value: str) -> Tuple[int, int]:
+    low, sep, high = value.partition("-")
+    try:
+        bounds = (int(low), int(high) if sep else int(low))
+    except ValueError:
+        raise typer.BadParameter("num-blocks must be N or LOW-HIGH") from None
+    if bounds[0] < 1 or bounds[1] < bounds[0]:
+        raise typer.BadParameter("num-blocks must satisfy 1 <= LOW <= HIGH")
+    return bounds
+
+
+def _scene_tasks(
+    n_scenes: int,
+    seed: int,
+    pos_frac: float,
+    num_blocks: Tuple[int, int] = (4, 4),
+) -> List[SceneTask]:
+    # Labels are drawn from a single stream up front so every worker count sees the same plan.
+    # Block counts use a second stream so fixed-count plans keep their historical labels.
+    rng = np.random.default_rng(seed)
+    block_rng = np.random.default_rng((seed, 1))
+    tasks: List[SceneTask] = []
+    for idx in range(n_scenes):
+        should_be_stable = rng.random() < pos_frac
+        count = int(block_rng.integers(num_blocks[0], num_blocks[1] + 1))
+        tasks.append((idx, seed + idx, bool(should_be_stable), count))
+    return tasks
+
+
+def _manifest_params(
+    seed: int,
+    pos_frac: float,
+    render_cfg: RenderConfig,
+    options: GenerationOptions,
+) -> Dict[str, object]:
+    render = {f.name: getattr(render_cfg, f.name) for f in fields(render_cfg) if not f.name.startswith("_")}
+    render["camera_poses"] = [asdict(pose) for pose in render_cfg.camera_poses]
+    return {"seed": seed, "pos_frac": pos_frac, "render": render, "generation": asdict(options)}
+
+
+def _sample_dir(root: pathlib.Path, idx: int) -> pathlib.Path:
+    return root / f"scene_{idx:05d}"
+
+
+def _chunk_tasks(tasks: List[SceneTask], batch_size: int) -> List[List[SceneTask]]:
+    # Chunks follow fixed index blocks so a resumed run batches the same towers together.
+    chunks: Dict[int, List[SceneTask]] = {}
+    for task in tasks:
+        chunks.setdefault(task[0] // batch_size, []).append(task)
+    return list(chunks.values())
+
+
+ChunkResult = List[Tuple[int, Optional[AuditRecord]]]
+
+
+def _simulate_and_write(
+    chunk: List[SceneTask],
+    root: pathlib.Path,
+    render_cfg: RenderConfig,
+    options: GenerationOptions,
+    audit_frac: float,
+    encode_workers: int,
+) -> Tuple[ChunkResult, List[Future]]:
+    world = _worker_world()
+    sink = _worker_sink(options.image_encoding, encode_workers)
+    fidelity = fidelity_profile(options.fidelity)
+    if len(chunk) == 1:
+        _, scene_seed, should_be_stable, num_blocks = chunk[0]
+        scenes = [
+            generate_scene(
+                seed=scene_seed,
+                num_blocks=num_blocks,
+                stable=should_be_stable,
+                world=world,
+                settle=options.settle,
+                render_config=render_cfg,
+                fidelity=fidelity,
+            )
+        ]
+    else:
+        scenes = generate_scene_batch(
+            seeds=[task[1] for task in chunk],
+            stables=[task[2] for task in chunk],
+            num_blocks=[task[3] for task in chunk],
+            spacing=max(6.0, 2 * MAX_BLOCK_HEIGHT * max(task[3] for task in chunk)),
+            world=world,
+            settle=options.settle,
+            render_config=render_cfg,
+            fidelity=fidelity,
+        )
+    results: ChunkResult = []
+    pending: List[Future] = []
+    for (idx, scene_seed, _, _), scene in zip(chunk, scenes):
+        sample_dir = _sample_dir(root, idx)
+        sample_dir.mkdir(parents=True, exist_ok=True)
+        pending.extend(_write_sample(sample_dir, scene, render_cfg, sink, world=world))
+        record = None
+        if should_audit(scene_seed, audit_frac):
+            record = audit_scene(scene, world=world, settle=options.settle, pose_tol=AUDIT_POSE_TOL)
+            record["index"] = idx
+        results.append((idx, record))
+    return results, pending
+
+
+def _finish_chunk(results: ChunkResult, pending: List[Future]) -> ChunkResult:
+    for future in pending:
+        future.result()
+    return results
+
+
+def _generate_and_write(
+    chunk: List[SceneTask],
+    root: pathlib.Path,
+    render_cfg: RenderConfig,
+    options: GenerationOptions,
+    audit_frac: float = 0.0,
+    encode_workers: int = 4,
+) -> ChunkResult:
+    return _finish_chunk(*_simulate_and_write(chunk, root, render_cfg, options, audit_frac, encode_workers))
+
+
+def _run_tasks(
+    tasks: List[SceneTask],
+    root: pathlib.Path,
+    render_cfg: RenderConfig,
+    options: GenerationOptions,
+    executor: Optional[ProcessPoolExecutor],
+    audit_frac: float = 0.0,
+    encode_workers: int = 4,
+) -> Iterator[Tuple[int, Optional[AuditRecord]]]:
+    chunks = _chunk_tasks(tasks, options.batch_size)
+    if executor is None:
+        # Views of chunk k encode on the sink's threads while chunk k + 1 simulates;
+        # a chunk is reported only once its files are complete.
+        in_flight: Deque[Tuple[ChunkResult, List[Future]]] = deque()
+        for chunk in chunks:
+            try:
+                started = _simulate_and_write(chunk, root, render_cfg, options, audit_frac, encode_workers)
+            except Exception:
+                # Report the chunks before the failing one so the error names the right scene.
+                while in_flight:
+                    yield from _finish_chunk(*in_flight.popleft())
+                raise
+            in_flight.append(started)
+            if len(in_flight) > 1:
+                yield from _finish_chunk(*in_flight.popleft())
+        while in_flight:
+            yield from _finish_chunk(*in_flight.popleft())
+        return
+    futures = [
+        executor.submit(_generate_and_write, chunk, root, render_cfg, options, audit_frac, encode_workers)
+        for chunk in chunks
+    ]
+    # Consume in submission order so progress and failures are reported against scene indices.
+    for future in futures:
+        yield from future.result()
+
+
+def _generate_all(
+    tasks: List[SceneTask],
+    root: pathlib.Path,
+    render_cfg: RenderConfig,
+    options: GenerationOptions,
+    workers: int,
+    on_sample: Optional[Callable[[SceneTask, pathlib.Path], None]] = None,
+    audit_frac: float = 0.0,
+    encode_workers: int = 4,
+) -> List[AuditRecord]:
+    total = len(tasks)
+    report_every = max(1, total // 100)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    done = 0
+    audits: List[AuditRecord] = []
+    try:
+        for idx, audit in _run_tasks(tasks, root, render_cfg, options, executor, audit_frac, encode_workers):
+            if audit is not None:
+                audits.append(audit)
+            if on_sample is not None:
+                on_sample(tasks[done], _sample_dir(root, idx))
+            done += 1
+            if done % report_every == 0 or done == total:
+                typer.echo(f"[{done}/{total}] scene_{idx:05d}")
+    except BrokenProcessPool as exc:
+        failed = tasks[done][0]
+        typer.echo(f"Worker process died while generating scene_{failed:05d}: {exc}", err=True)
+        raise typer.Exit(code=1) from exc
+    except Exception as exc:  # noqa: BLE001
+        failed = tasks[done][0]
+        typer.echo(f"Failed to generate scene_{failed:05d}: {exc!r}", err=True)
+        raise typer.Exit(code=1) from exc
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return audits
+
+
+def _write_audit(root: pathlib.Path, audits: List[AuditRecord], fidelity: str) -> pathlib.Path:
+    summary = summarize_audit(audits, fidelity, AUDIT_POSE_TOL)
+    typer.echo(
+        f"Fidelity audit ({fidelity} vs reference, {summary['audited']} scenes): "
+        f"labels disagree {summary['label_disagreement']:.1%}, "
+        f"poses disagree {summary['pose_disagreement']:.1%} (> {AUDIT_POSE_TOL} m)"
+    )
+    path = root / AUDIT_NAME
+    path.write_text(json.dumps({"summary": summary, "scenes": audits}, indent=2))
+    return path
 
 
 @app.command()
@@ -59,32 +347,152 @@ def main(
     pos_frac: float = typer.Option(0.5, help="Fraction of scenes that are physically possible"),
     views: int = typer.Option(4, help="Number of camera views"),
     seed: int = typer.Option(0, help="Random seed"),
+    workers: int = typer.Option(1, help="Worker processes for scene generation (1 = serial)"),
+    adaptive_settle: bool = typer.Option(False, help="Stop settling early once scenes are at rest or toppled"),
+    shadows: bool = typer.Option(True, help="Render shadows"),
+    save_depth: bool = typer.Option(False, help="Also save linear depth maps (.npy) per view"),
+    save_segmentation: bool = typer.Option(False, help="Also save body-id segmentation masks (.npy) per view"),
+    output_format: str = typer.Option("dir", help="Output layout: 'dir' (one directory per scene) or 'shards'"),
+    shard_size: int = typer.Option(1000, help="Samples per tar shard when --output-format shards"),
+    upload_workers: int = typer.Option(8, help="Concurrent uploads for gs:// targets"),
+    upload_queue: int = typer.Option(32, help="Max samples waiting for upload before generation pauses"),
+    resume: bool = typer.Option(True, help="Skip scenes already recorded in manifest.jsonl (local directory output)"),
+    batch_size: int = typer.Option(1, help="Towers simulated together in one physics world"),
+    fidelity: str = typer.Option("reference", help=f"Physics fidelity profile: {', '.join(FIDELITY_PROFILES)}"),
+    audit_frac: float = typer.Option(0.0, help="Fraction of scenes re-simulated at reference fidelity for comparison"),
+    num_blocks: str = typer.Option("4", help="Blocks per tower: a count N or an inclusive range LOW-HIGH"),
+    image_format: str = typer.Option("png", help=f"RGB view encoding: {', '.join(IMAGE_FORMATS)}"),
+    png_compression: int = typer.Option(6, help="zlib level 0-9 for PNG views"),
+    webp_method: int = typer.Option(4, help="Lossless WebP effort 0-6 (0 = fastest)"),
+    encode_workers: int = typer.Option(4, help="Image encoding threads per generation process"),
 ) -> None:
     default_cfg = RenderConfig()
     if views > len(default_cfg.camera_poses):
         raise typer.BadParameter(f"views must be <= {len(default_cfg.camera_poses)}")
-    render_cfg = RenderConfig(camera_poses=default_cfg.camera_poses[:views])
+    if workers < 1:
+        raise typer.BadParameter("workers must be >= 1")
+    block_range = _parse_num_blocks(num_blocks)
+    if image_format not in IMAGE_FORMATS:
+        raise typer.BadParameter(f"image-format must be one of {', '.join(IMAGE_FORMATS)}")
+    if not 0 <= png_compression <= 9:
+        raise typer.BadParameter("png-compression must be between 0 and 9")
+    if not 0 <= webp_method <= 6:
+        raise typer.BadParameter("webp-method must be between 0 and 6")
+    if encode_workers < 1:
+        raise typer.BadParameter("encode-workers must be >= 1")
+    if batch_size < 1:
+        raise typer.BadParameter("batch-size must be >= 1")
+    if batch_size > 1 and block_range[1] > MAX_BATCH_BLOCKS:
+        raise typer.BadParameter(f"batch-size > 1 supports at most {MAX_BATCH_BLOCKS} blocks per tower")
+    if fidelity not in FIDELITY_PROFILES:
+        raise typer.BadParameter(f"fidelity must be one of {', '.join(FIDELITY_PROFILES)}")
+    if not 0.0 <= audit_frac <= 1.0:
+        raise typer.BadParameter("audit-frac must be between 0 and 1")
+    if output_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(f"output-format must be one of {', '.join(OUTPUT_FORMATS)}")
+    render_cfg = RenderConfig(
+        camera_poses=default_cfg.camera_poses[:views],
+        shadows=shadows,
+        save_depth=save_depth,
+        save_segmentation=save_segmentation,
+    )
     base_path = pathlib.Path(out)
     use_gcs = _is_gcs_path(out)
 
-    rng = np.random.default_rng(seed)
+    uploader: Optional[StreamingUploader] = None
     if use_gcs:
         tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix="itower_"))
+        bucket, prefix = _gcs_bucket(out)
+        # Samples are uploaded as soon as they are written and then removed locally.
+        uploader = StreamingUploader(bucket, prefix, tmp_dir, workers=upload_workers, max_pending=upload_queue)
     else:
         base_path.mkdir(parents=True, exist_ok=True)
         tmp_dir = base_path
+    publish = uploader.submit if uploader is not None else None
 
-    for idx in range(n_scenes):
-        scene_seed = seed + idx
-        should_be_stable = rng.random() < pos_frac
-        scene = generate_scene(seed=scene_seed, stable=should_be_stable)
-        sample_dir = tmp_dir / f"scene_{idx:05d}"
-        sample_dir.mkdir(parents=True, exist_ok=True)
-        _write_sample(sample_dir, scene, render_cfg)
+    options = GenerationOptions(
+        settle=SettleConfig() if adaptive_settle else None,
+        batch_size=batch_size,
+        fidelity=fidelity,
+        num_blocks=block_range,
+        image_encoding=ImageEncoding(image_format, png_compression=png_compression, webp_method=webp_method),
+    )
+    tasks = _scene_tasks(n_scenes, seed, pos_frac, block_range)
+    manifest: Optional[DatasetManifest] = None
+    if output_format == "dir" and not use_gcs:
+        try:
+            manifest = DatasetManifest(tmp_dir, _manifest_params(seed, pos_frac, render_cfg, options), resume=resume)
+        except ManifestError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+        pending = [task for task in tasks if not manifest.is_complete(task[0], _sample_dir(tmp_dir, task[0]))]
+        if len(pending) < len(tasks):
+            typer.echo(f"Skipping {len(tasks) - len(pending)} scenes already complete in {tmp_dir}")
+        tasks = pending
+
+    try:
+        if output_format == "shards":
+            writer = ShardWriter(tmp_dir, samples_per_shard=shard_size, on_shard=publish)
+
+            def _pack(task: SceneTask, sample_dir: pathlib.Path) -> None:
+                writer.add_directory(sample_dir)
+                shutil.rmtree(sample_dir)
+
+            audits = _generate_all(
+                tasks,
+                tmp_dir,
+                render_cfg,
+                options,
+                workers,
+                on_sample=_pack,
+                audit_frac=audit_frac,
+                encode_workers=encode_workers,
+            )
+            writer.close()
+            if publish is not None:
+                publish(tmp_dir / INDEX_NAME)
+        elif manifest is not None:
+
+            def _record(task: SceneTask, sample_dir: pathlib.Path) -> None:
+                idx, scene_seed, should_be_stable, _ = task
+                manifest.record(idx, scene_seed, should_be_stable, sample_dir)
+
+            audits = _generate_all(
+                tasks,
+                tmp_dir,
+                render_cfg,
+                options,
+                workers,
+                on_sample=_record,
+                audit_frac=audit_frac,
+                encode_workers=encode_workers,
+            )
+        else:
+
+            def _publish(task: SceneTask, sample_dir: pathlib.Path) -> None:
+                uploader.submit(sample_dir)  # type: ignore[union-attr]
+
+            audits = _generate_all(
+                tasks,
+                tmp_dir,
+                render_cfg,
+                options,
+                workers,
+                on_sample=_publish,
+                audit_frac=audit_frac,
+                encode_workers=encode_workers,
+            )
+        if audits:
+            audit_path = _write_audit(tmp_dir, audits, fidelity)
+            if publish is not None:
+                publish(audit_path)
+    finally:
+        if manifest is not None:
+            manifest.close()
+        if uploader is not None:
+            _finish_upload(uploader)
 
-    rng = np.random.default_rng(seed)
     if use_gcs:
-        _upload_directory(tmp_dir, out)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
         typer.echo(f"Uploaded dataset to {out}")
     else:
         typer.echo(f"Dataset available at {base_path}")
@@ -0,0 +1,102 @@
+"""Append-only manifest that makes dataset generation resumable."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+from typing import Any, Dict, Mapping, TextIO
+
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def _normalize(value: Any) -> Any:
+    return json.loads(json.dumps(value))
+
+
+def hash_sample(sample_dir: pathlib.Path) -> Dict[str, Dict[str, object]]:
+    files: Dict[str, Dict[str, object]] = {}
+    for path in sorted(sample_dir.rglob("*")):
+        if path.is_file():
+            data = path.read_bytes()
+            files[path.relative_to(sample_dir).as_posix()] = {
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "size": len(data),
+            }
+    return files
+
+
+class DatasetManifest:
+    """Tracks finished scenes in ``manifest.jsonl`` under the dataset root.
+
+    The first line stores the generation parameters; every following line
+    records one finished scene (index, seed, label and per-file SHA-256). A rerun
+    with different parameters is rejected, because its scenes would not match
+    the ones already on disk. ``n_scenes`` is deliberately not a parameter, so
+    a dataset can be extended in place.
+    """
+
+    def __init__(self, root: pathlib.Path, params: Mapping[str, object], resume: bool = True) -> None:
+        self.path = root / MANIFEST_NAME
+        self.params = _normalize(dict(params))
+        self.records: Dict[int, Dict[str, Any]] = {}
+        if resume and self.path.exists():
+            self._load()
+            self._handle: TextIO = self.path.open("a", encoding="utf-8")
+        else:
+            self._handle = self.path.open("w", encoding="utf-8")
+            self._append({"params": self.params})
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        if not lines:
+            raise ManifestError(f"{self.path} is empty")
+        header = json.loads(lines[0])
+        if header.get("params") != self.params:
+            raise ManifestError(
+                f"{self.path} was written with different parameters; "
+                "use a new output directory or --no-resume"
+            )
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated final line.
+                continue
+            self.records[int(record["index"])] = record
+
+    def _append(self, record: Mapping[str, object]) -> None:
+        self._handle.write(json.dumps(record, sort_keys=True) + "\n")
+        self._handle.flush()
+
+    def is_complete(self, index: int, sample_dir: pathlib.Path) -> bool:
+        record = self.records.get(index)
+        if record is None or not sample_dir.is_dir():
+            return False
+        return hash_sample(sample_dir) == record["files"]
+
+    def record(self, index: int, seed: int, stable: bool, sample_dir: pathlib.Path) -> None:
+        record = {
+            "index": index,
+            "sample_id": sample_dir.name,
+            "seed": seed,
+            "stable": stable,
+            "files": hash_sample(sample_dir),
+        }
+        self.records[index] = record
+        self._append(record)
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "DatasetManifest":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pybullet as p
 import pybullet_data
 
+if TYPE_CHECKING:
+    from .render import RenderConfig
+
 
 Vec3 = Tuple[float, float, float]
 Quat = Tuple[float, float, float, float]
@@ -39,23 +42,118 @@ class SceneSample:
     contacts: List[Dict[str, object]]
     stable: bool
     seed: int
+    settle_steps: Optional[int] = None
+    max_displacement: Optional[float] = None
+    images: Optional[Dict[str, np.ndarray]] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class SettleConfig:
+    """Early-exit settling: stop once every body is at rest or a topple is evident."""
+
+    max_steps: int = 480
+    check_every: int = 10
+    linear_tol: float = 0.01
+    angular_tol: float = 0.05
+    rest_checks: int = 2
+    topple_displacement: float = 0.1
+
+
+REFERENCE_TIMESTEP = 1.0 / 240.0
+# Fixed settle length (2 s of simulated time at the reference timestep).
+SETTLE_STEPS = 480
+
+
+@dataclass(frozen=True)
+class FidelityProfile:
+    """Physics accuracy/speed trade-off applied to a client.
+
+    Step counts elsewhere (the fixed 480-step settle, :class:`SettleConfig`) are
+    expressed at the reference 1/240 s timestep and rescaled with
+    :meth:`steps_for`, so every profile simulates the same amount of time.
+    """
+
+    timestep: float = REFERENCE_TIMESTEP
+    solver_iterations: int = 50
+    substeps: int = 0
 
+    def steps_for(self, reference_steps: int) -> int:
+        return max(1, int(round(reference_steps * REFERENCE_TIMESTEP / self.timestep)))
+
+
+FIDELITY_PROFILES: Dict[str, FidelityProfile] = {
+    "reference": FidelityProfile(),
+    "fast": FidelityProfile(timestep=1.0 / 120.0, solver_iterations=20),
+    "draft": FidelityProfile(timestep=1.0 / 60.0, solver_iterations=10, substeps=2),
+}
+REFERENCE_FIDELITY = FIDELITY_PROFILES["reference"]
+
+
+def fidelity_profile(name: str) -> FidelityProfile:
+    try:
+        return FIDELITY_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown fidelity profile {name!r}; choose from {', '.join(FIDELITY_PROFILES)}") from None
+
+
+def _apply_fidelity(client: int, fidelity: FidelityProfile) -> None:
+    p.setPhysicsEngineParameter(
+        fixedTimeStep=fidelity.timestep,
+        numSolverIterations=fidelity.solver_iterations,
+        numSubSteps=fidelity.substeps,
+        physicsClientId=client,
+    )
+
+
+def _scaled_settle(settle: Optional[SettleConfig], fidelity: FidelityProfile) -> Optional[SettleConfig]:
+    if settle is None or fidelity.timestep == REFERENCE_TIMESTEP:
+        return settle
+    return replace(
+        settle,
+        max_steps=fidelity.steps_for(settle.max_steps),
+        check_every=fidelity.steps_for(settle.check_every),
+    )
+
+
+GROUND_NAME = "ground"
+# plane.urdf collides as a 200 m x 200 m box centred on the origin.
+GROUND_HALF_EXTENT = 100.0
 
 DEFAULT_FRICTION = 0.8
 DEFAULT_RESTITUTION = 0.0
 GRAVITY = -9.81
 
 
-def configure_pybullet(gui: bool = False, seed: Optional[int] = None) -> int:
-    client = p.connect(p.GUI if gui else p.DIRECT)
-    p.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client)
+def _setup_world(client: int, fidelity: FidelityProfile = REFERENCE_FIDELITY) -> int:
     p.resetSimulation(physicsClientId=client)
     p.setGravity(0, 0, GRAVITY, physicsClientId=client)
-    p.setTimeStep(1.0 / 240.0, physicsClientId=client)
+    _apply_fidelity(client, fidelity)
+    plane_id = p.loadURDF("plane.urdf", physicsClientId=client)
+    p.changeDynamics(
+        plane_id,
+        -1,
+        lateralFriction=DEFAULT_FRICTION,
+        restitution=DEFAULT_RESTITUTION,
+        physicsClientId=client,
+    )
+    return plane_id
+
+
+def _connect(gui: bool = False) -> int:
+    client = p.connect(p.GUI if gui else p.DIRECT)
+    p.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client)
+    return client
+
+
+def configure_pybullet(
+    gui: bool = False,
+    seed: Optional[int] = None,
+    fidelity: FidelityProfile = REFERENCE_FIDELITY,
+) -> int:
+    client = _connect(gui)
     if seed is not None:
         np.random.seed(seed)
-    plane_id = p.loadURDF("plane.urdf", physicsClientId=client)
-    p.changeDynamics(plane_id, -1, lateralFriction=DEFAULT_FRICTION, restitution=DEFAULT_RESTITUTION)
+    _setup_world(client, fidelity)
     return client
 
 
@@ -68,14 +166,24 @@ def random_block_specs(num_blocks: int, rng: np.random.Generator) -> List[BlockS
     return specs
 
 
-def spawn_block(block: BlockSpec, pose: Tuple[Vec3, Quat], client: int) -> int:
-    collision = p.createCollisionShape(p.GEOM_BOX, halfExtents=block.half_extents, physicsClientId=client)
+def create_block_shapes(half_extents: Vec3, client: int) -> Tuple[int, int]:
+    collision = p.createCollisionShape(p.GEOM_BOX, halfExtents=half_extents, physicsClientId=client)
     visual = p.createVisualShape(
         p.GEOM_BOX,
-        halfExtents=block.half_extents,
+        halfExtents=half_extents,
         rgbaColor=(0.6, 0.6, 0.9, 1.0),
         physicsClientId=client,
     )
+    return collision, visual
+
+
+def spawn_block(
+    block: BlockSpec,
+    pose: Tuple[Vec3, Quat],
+    client: int,
+    shapes: Optional[Tuple[int, int]] = None,
+) -> int:
+    collision, visual = shapes if shapes is not None else create_block_shapes(block.half_extents, client)
     body_id = p.createMultiBody(
         baseMass=block.mass,
         baseCollisionShapeIndex=collision,
@@ -94,9 +202,130 @@ def spawn_block(block: BlockSpec, pose: Tuple[Vec3, Quat], client: int) -> int:
     return body_id
 
 
-def settle_simulation(client: int, steps: int = 480) -> None:
-    for _ in range(steps):
-        p.stepSimulation(physicsClientId=client)
+class TowerWorld:
+    """A PyBullet client whose ground plane and block shapes outlive a single scene.
+
+    Block bodies are removed by :meth:`clear`; the client is only reset once the
+    shape cache grows past ``max_cached_shapes``.
+    """
+
+    def __init__(
+        self,
+        gui: bool = False,
+        max_cached_shapes: int = 2048,
+        fidelity: FidelityProfile = REFERENCE_FIDELITY,
+    ) -> None:
+        self.client = _connect(gui)
+        self.fidelity = fidelity
+        self.plane_id = _setup_world(self.client, fidelity)
+        self.max_cached_shapes = max_cached_shapes
+        self._shapes: Dict[Vec3, Tuple[int, int]] = {}
+        self._bodies: List[int] = []
+
+    def __enter__(self) -> "TowerWorld":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def spawn_block(self, block: BlockSpec, pose: Tuple[Vec3, Quat]) -> int:
+        shapes = self._shapes.get(block.half_extents)
+        if shapes is None:
+            shapes = create_block_shapes(block.half_extents, self.client)
+            self._shapes[block.half_extents] = shapes
+        body_id = spawn_block(block, pose, self.client, shapes=shapes)
+        self._bodies.append(body_id)
+        return body_id
+
+    def remove(self, body_ids: Sequence[int]) -> None:
+        doomed = set(body_ids)
+        for body_id in body_ids:
+            p.removeBody(body_id, physicsClientId=self.client)
+        self._bodies = [body_id for body_id in self._bodies if body_id not in doomed]
+
+    def clear(self) -> None:
+        for body_id in self._bodies:
+            p.removeBody(body_id, physicsClientId=self.client)
+        self._bodies = []
+        if len(self._shapes) >= self.max_cached_shapes:
+            self.reset()
+
+    def set_fidelity(self, fidelity: FidelityProfile) -> None:
+        if fidelity != self.fidelity:
+            _apply_fidelity(self.client, fidelity)
+            self.fidelity = fidelity
+
+    def reset(self) -> None:
+        self.plane_id = _setup_world(self.client, self.fidelity)
+        self._shapes = {}
+        self._bodies = []
+
+    def close(self) -> None:
+        if p.isConnected(physicsClientId=self.client):
+            p.disconnect(self.client)
+
+
+def _settle_state(
+    client: int, body_ids: Sequence[int], spawn_positions: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-body linear speed, angular speed and displacement from the spawn position."""
+    positions = np.empty((len(body_ids), 3))
+    lin = np.empty((len(body_ids), 3))
+    ang = np.empty((len(body_ids), 3))
+    for i, body_id in enumerate(body_ids):
+        positions[i] = p.getBasePositionAndOrientation(body_id, physicsClientId=client)[0]
+        lin[i], ang[i] = p.getBaseVelocity(body_id, physicsClientId=client)
+    displacement = np.linalg.norm(positions - spawn_positions, axis=1)
+    return np.linalg.norm(lin, axis=1), np.linalg.norm(ang, axis=1), displacement
+
+
+def settle_simulation(
+    client: int,
+    steps: int = SETTLE_STEPS,
+    body_ids: Optional[Sequence[int]] = None,
+    config: Optional[SettleConfig] = None,
+    groups: Optional[Sequence[Sequence[int]]] = None,
+) -> int:
+    """Step the simulation and return the number of steps taken.
+
+    Without ``config`` (or without bodies to watch) this runs exactly ``steps``
+    steps. With a :class:`SettleConfig`, velocities and spawn displacement are
+    sampled every ``check_every`` steps. A tower is done once all its bodies have
+    been at rest for ``rest_checks`` consecutive samples, or once any of them has
+    moved further than ``topple_displacement`` from where it spawned. ``groups``
+    splits ``body_ids`` (by position) into independent towers sharing the world;
+    by default all bodies form one tower. The loop stops when every tower is done.
+    """
+    if config is None or not body_ids:
+        for _ in range(steps):
+            p.stepSimulation(physicsClientId=client)
+        return steps
+
+    spawn_positions = np.array(
+        [p.getBasePositionAndOrientation(body_id, physicsClientId=client)[0] for body_id in body_ids]
+    )
+    members = [list(group) for group in groups] if groups else [list(range(len(body_ids)))]
+    at_rest = [0] * len(members)
+    done = [False] * len(members)
+    taken = 0
+    while taken < config.max_steps:
+        chunk = min(config.check_every, config.max_steps - taken)
+        for _ in range(chunk):
+            p.stepSimulation(physicsClientId=client)
+        taken += chunk
+        lin, ang, displacement = _settle_state(client, body_ids, spawn_positions)
+        for g, idx in enumerate(members):
+            if done[g]:
+                continue
+            if displacement[idx].max() > config.topple_displacement:
+                done[g] = True
+                continue
+            resting = lin[idx].max() < config.linear_tol and ang[idx].max() < config.angular_tol
+            at_rest[g] = at_rest[g] + 1 if resting else 0
+            done[g] = at_rest[g] >= config.rest_checks
+        if all(done):
+            break
+    return taken
 
 
 def _generate_stack_layout(
@@ -125,60 +354,279 @@ def _generate_stack_layout(
     return poses
 
 
-def collect_contacts(client: int, id_to_name: Dict[int, str]) -> List[Dict[str, object]]:
+def _to_local(point: Sequence[float], offset: Vec3) -> Vec3:
+    if offset == (0.0, 0.0, 0.0):
+        return point  # type: ignore[return-value]
+    return (point[0] - offset[0], point[1] - offset[1], point[2] - offset[2])
+
+
+def _oriented_point(cp: Sequence[object], body: int) -> Tuple[Vec3, Vec3, Vec3, float]:
+    """Return (position_on_body, position_on_other, normal_towards_body, force) for ``body``."""
+    if cp[1] == body:
+        return cp[5], cp[6], cp[7], cp[9]  # type: ignore[return-value]
+    normal = tuple(-float(v) for v in cp[7])  # type: ignore[attr-defined]
+    return cp[6], cp[5], normal, cp[9]  # type: ignore[return-value]
+
+
+def collect_contacts(
+    client: int,
+    id_to_name: Dict[int, str],
+    ground_id: Optional[int] = None,
+) -> List[Dict[str, object]]:
+    """Collect every contact point with a single ``getContactPoints`` sweep.
+
+    Points are grouped per body pair, and pairs are emitted in ``id_to_name``
+    order, with ground contacts (reported as ``GROUND_NAME``) last. Each pair is
+    oriented so that ``body_b`` is the supporter: the normal (on B, pointing
+    towards A) has a non-negative summed z component, and the ground is always
+    ``body_b``.
+    """
+    return _group_contacts(p.getContactPoints(physicsClientId=client), id_to_name, ground_id)
+
+
+def _group_contacts(
+    points: Sequence[Sequence[object]],
+    id_to_name: Dict[int, str],
+    ground_id: Optional[int],
+    offset: Vec3 = (0.0, 0.0, 0.0),
+) -> List[Dict[str, object]]:
+    order = {body: i for i, body in enumerate(id_to_name)}
+    names = dict(id_to_name)
+    if ground_id is not None:
+        order[ground_id] = len(order)
+        names[ground_id] = GROUND_NAME
+
+    pairs: Dict[Tuple[int, int], List[Sequence[object]]] = {}
+    for cp in points:
+        a, b = cp[1], cp[2]
+        if a == b or a not in order or b not in order:
+            continue
+        key = (a, b) if order[a] < order[b] else (b, a)
+        pairs.setdefault(key, []).append(cp)
+
     contacts: List[Dict[str, object]] = []
-    ids = list(id_to_name.keys())
-    for idx_a, body_a in enumerate(ids):
-        for body_b in ids[idx_a + 1 :]:
-            for cp in p.getContactPoints(bodyA=body_a, bodyB=body_b, physicsClientId=client):
-                contacts.append(
-                    {
-                        "body_a": id_to_name[body_a],
-                        "body_b": id_to_name[body_b],
-                        "position_on_a": cp[5],
-                        "position_on_b": cp[6],
-                        "normal": cp[7],
-                        "normal_force": cp[9],
-                    }
-                )
+    for first, second in sorted(pairs, key=lambda k: (order[k[0]], order[k[1]])):
+        oriented = [_oriented_point(cp, first) for cp in pairs[(first, second)]]
+        if second != ground_id and sum(normal[2] for _, _, normal, _ in oriented) < 0:
+            first, second = second, first
+            oriented = [(pos_b, pos_a, tuple(-v for v in normal), force) for pos_a, pos_b, normal, force in oriented]
+        for pos_a, pos_b, normal, force in oriented:
+            contacts.append(
+                {
+                    "body_a": names[first],
+                    "body_b": names[second],
+                    "position_on_a": _to_local(pos_a, offset),
+                    "position_on_b": _to_local(pos_b, offset),
+                    "normal": normal,
+                    "normal_force": force,
+                }
+            )
     return contacts
 
 
-def generate_scene(seed: int, num_blocks: int = 4, stable: Optional[bool] = None, gui: bool = False) -> SceneSample:
+def _object_states(
+    client: int,
+    specs: Sequence[BlockSpec],
+    body_ids: Sequence[int],
+    offset: Vec3 = (0.0, 0.0, 0.0),
+) -> List[ObjectState]:
+    objects: List[ObjectState] = []
+    for spec, body_id in zip(specs, body_ids):
+        pos, quat = p.getBasePositionAndOrientation(body_id, physicsClientId=client)
+        lin_vel, ang_vel = p.getBaseVelocity(body_id, physicsClientId=client)
+        aabb_min, aabb_max = p.getAABB(body_id, physicsClientId=client)
+        objects.append(
+            ObjectState(
+                name=spec.name,
+                block=spec,
+                position=_to_local(pos, offset),
+                orientation=quat,
+                linear_velocity=lin_vel,
+                angular_velocity=ang_vel,
+                aabb_min=_to_local(aabb_min, offset),
+                aabb_max=_to_local(aabb_max, offset),
+            )
+        )
+    return objects
+
+
+def _max_displacement(objects: Sequence[ObjectState], spawn_positions: Sequence[Vec3]) -> float:
+    settled = np.array([obj.position for obj in objects])
+    return float(np.linalg.norm(settled - np.asarray(spawn_positions), axis=1).max())
+
+
+def generate_scene(
+    seed: int,
+    num_blocks: int = 4,
+    stable: Optional[bool] = None,
+    gui: bool = False,
+    world: Optional[TowerWorld] = None,
+    settle: Optional[SettleConfig] = None,
+    render_config: Optional["RenderConfig"] = None,
+    fidelity: FidelityProfile = REFERENCE_FIDELITY,
+) -> SceneSample:
+    """Simulate one tower and snapshot its settled state.
+
+    When ``render_config`` is given the camera views are captured from the
+    simulation client before it is cleared and attached as ``SceneSample.images``.
+    ``fidelity`` is applied to ``world`` for this scene and stays in effect.
+    """
     rng = np.random.default_rng(seed)
     is_stable = stable if stable is not None else bool(rng.integers(0, 2))
-    client = configure_pybullet(gui=gui, seed=seed)
+    owns_world = world is None
+    if world is None:
+        world = TowerWorld(gui=gui, fidelity=fidelity)
+    else:
+        world.clear()
+        world.set_fidelity(fidelity)
+    np.random.seed(seed)
+    client = world.client
     specs = random_block_specs(num_blocks=num_blocks, rng=rng)
     poses = _generate_stack_layout(specs=specs, stable=is_stable, rng=rng)
 
-    objects: List[ObjectState] = []
     id_to_name: Dict[int, str] = {}
     body_ids: List[int] = []
 
     for spec, pose in zip(specs, poses):
-        body_id = spawn_block(spec, pose, client)
+        body_id = world.spawn_block(spec, pose)
         id_to_name[body_id] = spec.name
         body_ids.append(body_id)
 
-    settle_simulation(client)
+    settle_steps = settle_simulation(
+        client,
+        steps=fidelity.steps_for(SETTLE_STEPS),
+        body_ids=body_ids,
+        config=_scaled_settle(settle, fidelity),
+    )
 
-    for spec, body_id in zip(specs, body_ids):
-        pos, quat = p.getBasePositionAndOrientation(body_id, physicsClientId=client)
-        lin_vel, ang_vel = p.getBaseVelocity(body_id, physicsClientId=client)
-        aabb_min, aabb_max = p.getAABB(body_id, physicsClientId=client)
-        objects.append(
-            ObjectState(
-                name=spec.name,
-                block=spec,
-                position=pos,
-                orientation=quat,
-                linear_velocity=lin_vel,
-                angular_velocity=ang_vel,
-                aabb_min=aabb_min,
-                aabb_max=aabb_max,
+    objects = _object_states(client, specs, body_ids)
+    max_displacement = _max_displacement(objects, [pose[0] for pose in poses])
+
+    contacts = collect_contacts(client, id_to_name, ground_id=world.plane_id)
+    images = None
+    if render_config is not None:
+        from .render import capture_views
+
+        images = capture_views(client, render_config)
+    if owns_world:
+        world.close()
+    else:
+        world.clear()
+    return SceneSample(
+        objects=objects,
+        contacts=contacts,
+        stable=is_stable,
+        seed=seed,
+        settle_steps=settle_steps,
+        max_displacement=max_displacement,
+        images=images,
+    )
+
+
+def batch_offsets(count: int, spacing: float) -> List[Vec3]:
+    """Grid positions for ``count`` towers, ``spacing`` metres apart."""
+    cols = max(1, int(np.ceil(np.sqrt(count))))
+    return [(float((k % cols) * spacing), float((k // cols) * spacing), 0.0) for k in range(count)]
+
+
+def generate_scene_batch(
+    seeds: Sequence[int],
+    stables: Optional[Sequence[Optional[bool]]] = None,
+    num_blocks: Union[int, Sequence[int]] = 4,
+    world: Optional[TowerWorld] = None,
+    settle: Optional[SettleConfig] = None,
+    render_config: Optional["RenderConfig"] = None,
+    spacing: float = 6.0,
+    fidelity: FidelityProfile = REFERENCE_FIDELITY,
+) -> List[SceneSample]:
+    """Simulate several independent towers in one world with a shared step loop.
+
+    Each tower's blocks and layout come only from its own seed, exactly as in
+    :func:`generate_scene`; towers are placed on a grid ``spacing`` metres apart
+    and every returned sample is expressed in its tower's local frame. Towers do
+    not interact, but solver ordering differs from a solo world, so settled poses
+    can differ from :func:`generate_scene` at floating-point noise level. With
+    adaptive settling every sample records the shared step count. Views are
+    rendered by moving one tower at a time to the origin (where the default
+    cameras and shadow map are centred) and removing it afterwards; ``spacing``
+    must exceed the camera far plane so neighbours stay out of frame.
+    ``num_blocks`` is either one count for every tower or one count per seed.
+    """
+    stables = list(stables) if stables is not None else [None] * len(seeds)
+    if len(stables) != len(seeds):
+        raise ValueError("stables must match seeds")
+    block_counts = [num_blocks] * len(seeds) if isinstance(num_blocks, int) else list(num_blocks)
+    if len(block_counts) != len(seeds):
+        raise ValueError("num_blocks must be an int or match seeds")
+    owns_world = world is None
+    if world is None:
+        world = TowerWorld(fidelity=fidelity)
+    else:
+        world.clear()
+        world.set_fidelity(fidelity)
+    client = world.client
+    offsets = batch_offsets(len(seeds), spacing)
+
+    towers = []
+    body_ids: List[int] = []
+    groups: List[List[int]] = []
+    for seed, stable, count, offset in zip(seeds, stables, block_counts, offsets):
+        rng = np.random.default_rng(seed)
+        is_stable = stable if stable is not None else bool(rng.integers(0, 2))
+        specs = random_block_specs(num_blocks=count, rng=rng)
+        poses = _generate_stack_layout(specs=specs, stable=is_stable, rng=rng)
+        ids: List[int] = []
+        for spec, (pos, quat) in zip(specs, poses):
+            shifted = (pos[0] + offset[0], pos[1] + offset[1], pos[2] + offset[2])
+            ids.append(world.spawn_block(spec, (shifted, quat)))
+        groups.append(list(range(len(body_ids), len(body_ids) + len(ids))))
+        body_ids.extend(ids)
+        towers.append((seed, is_stable, specs, ids, [pose[0] for pose in poses], offset))
+
+    settle_steps = settle_simulation(
+        client,
+        steps=fidelity.steps_for(SETTLE_STEPS),
+        body_ids=body_ids,
+        config=_scaled_settle(settle, fidelity),
+        groups=groups,
+    )
+
+    tower_of = {body_id: k for k, tower in enumerate(towers) for body_id in tower[3]}
+    per_tower: List[List[Sequence[object]]] = [[] for _ in towers]
+    for cp in p.getContactPoints(physicsClientId=client):
+        a, b = cp[1], cp[2]
+        owners = {tower_of[body] for body in (a, b) if body in tower_of}
+        if len(owners) > 1:
+            raise RuntimeError(f"towers {sorted(owners)} touched; increase spacing")
+        if owners:
+            per_tower[owners.pop()].append(cp)
+
+    samples: List[SceneSample] = []
+    for (seed, is_stable, specs, ids, spawn, offset), points in zip(towers, per_tower):
+        id_to_name = {body_id: spec.name for spec, body_id in zip(specs, ids)}
+        objects = _object_states(client, specs, ids, offset)
+        samples.append(
+            SceneSample(
+                objects=objects,
+                contacts=_group_contacts(points, id_to_name, world.plane_id, offset),
+                stable=is_stable,
+                seed=seed,
+                settle_steps=settle_steps,
+                max_displacement=_max_displacement(objects, spawn),
             )
         )
 
-    contacts = collect_contacts(client, id_to_name)
-    p.disconnect(client)
-    return SceneSample(objects=objects, contacts=contacts, stable=is_stable, seed=seed)
+    if render_config is not None:
+        from .render import capture_views
+
+        for sample, (_, _, _, ids, _, _) in zip(samples, towers):
+            for obj, body_id in zip(sample.objects, ids):
+                p.resetBasePositionAndOrientation(body_id, obj.position, obj.orientation, physicsClientId=client)
+            sample.images = capture_views(client, render_config)
+            world.remove(ids)
+
+    if owns_world:
+        world.close()
+    else:
+        world.clear()
+    return samples
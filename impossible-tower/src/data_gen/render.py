@@ -2,19 +2,22 @@
 
 from __future__ import annotations
 
+import io
 import json
 import pathlib
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Mapping, MutableMapping, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
 
 import numpy as np
 import pybullet as p
 from PIL import Image
 
-from .pybullet_worlds import BlockSpec, SceneSample, configure_pybullet, spawn_block
+from .pybullet_worlds import BlockSpec, SceneSample, TowerWorld
 
 
 Vec3 = Tuple[float, float, float]
+Matrix = Tuple[float, ...]
 
 
 @dataclass
@@ -37,51 +40,214 @@ class RenderConfig:
         CameraPose(position=(-0.6, 0.0, 0.4), target=(0.0, 0.0, 0.2)),
         CameraPose(position=(0.0, -0.6, 0.4), target=(0.0, 0.0, 0.2)),
     )
+    shadows: bool = True
+    save_depth: bool = False
+    save_segmentation: bool = False
+    _matrices: Optional[Tuple[Matrix, List[Matrix]]] = field(default=None, init=False, repr=False, compare=False)
 
+    def camera_matrices(self) -> Tuple[Matrix, List[Matrix]]:
+        """Return ``(projection, [view per pose])``, computed on first use and cached.
 
-def _respawn_static_scene(scene: SceneSample) -> Tuple[int, Mapping[str, int]]:
-    client = configure_pybullet(gui=False)
+        The cache is not invalidated if the config is mutated afterwards.
+        """
+        if self._matrices is None:
+            projection = p.computeProjectionMatrixFOV(
+                fov=self.fov, aspect=self.width / self.height, nearVal=self.near, farVal=self.far
+            )
+            views = [
+                p.computeViewMatrix(cameraEyePosition=pose.position, cameraTargetPosition=pose.target, cameraUpVector=pose.up)
+                for pose in self.camera_poses
+            ]
+            self._matrices = (projection, views)
+        return self._matrices
+
+
+def _linear_depth(zbuffer: np.ndarray, near: float, far: float) -> np.ndarray:
+    return (far * near / (far - (far - near) * zbuffer)).astype(np.float32)
+
+
+def _respawn_static_scene(scene: SceneSample, world: TowerWorld) -> Mapping[str, int]:
+    world.clear()
+    client = world.client
     body_ids: Dict[str, int] = {}
     for obj in scene.objects:
         pose = (obj.position, obj.orientation)
-        body_ids[obj.name] = spawn_block(obj.block, pose, client)
+        body_ids[obj.name] = world.spawn_block(obj.block, pose)
         p.resetBaseVelocity(body_ids[obj.name], linearVelocity=(0, 0, 0), angularVelocity=(0, 0, 0), physicsClientId=client)
         p.resetBasePositionAndOrientation(body_ids[obj.name], obj.position, obj.orientation, physicsClientId=client)
-    return client, body_ids
+    return body_ids
 
 
-def render_views(scene: SceneSample, config: RenderConfig | None = None) -> Dict[str, np.ndarray]:
-    cfg = config or RenderConfig()
-    client, body_lookup = _respawn_static_scene(scene)
+def capture_views(client: int, cfg: RenderConfig) -> Dict[str, np.ndarray]:
+    """Render every configured camera from whatever is currently in ``client``.
+
+    RGB views are keyed ``cam_XX``. Linear depth (metres, float32) and body-id
+    segmentation (int32) are added as ``cam_XX_depth`` / ``cam_XX_seg`` when the
+    config asks for them; the segmentation pass is skipped entirely otherwise.
+    """
     width, height = cfg.width, cfg.height
-    aspect = width / height
+    proj_matrix, view_matrices = cfg.camera_matrices()
+    flags = 0 if cfg.save_segmentation else p.ER_NO_SEGMENTATION_MASK
     results: Dict[str, np.ndarray] = {}
 
-    for idx, pose in enumerate(cfg.camera_poses):
-        view_matrix = p.computeViewMatrix(cameraEyePosition=pose.position, cameraTargetPosition=pose.target, cameraUpVector=pose.up)
-        proj_matrix = p.computeProjectionMatrixFOV(fov=cfg.fov, aspect=aspect, nearVal=cfg.near, farVal=cfg.far)
+    for idx, view_matrix in enumerate(view_matrices):
         image = p.getCameraImage(
             width=width,
             height=height,
             viewMatrix=view_matrix,
             projectionMatrix=proj_matrix,
-            shadow=1,
+            shadow=1 if cfg.shadows else 0,
             lightDirection=[1, 1, 1],
+            flags=flags,
             physicsClientId=client,
         )
         rgba = np.reshape(image[2], (height, width, 4))
         cam_id = f"cam_{idx:02d}"
         results[cam_id] = rgba[:, :, :3].astype(np.uint8)
+        if cfg.save_depth:
+            zbuffer = np.reshape(image[3], (height, width))
+            results[f"{cam_id}_depth"] = _linear_depth(zbuffer, cfg.near, cfg.far)
+        if cfg.save_segmentation:
+            results[f"{cam_id}_seg"] = np.reshape(image[4], (height, width)).astype(np.int32)
+    return results
+
 
-    p.disconnect(client)
+def render_views(
+    scene: SceneSample,
+    config: RenderConfig | None = None,
+    world: Optional[TowerWorld] = None,
+) -> Dict[str, np.ndarray]:
+    """Re-render a saved scene by respawning its blocks at their recorded poses."""
+    cfg = config or RenderConfig()
+    owns_world = world is None
+    if world is None:
+        world = TowerWorld()
+    _respawn_static_scene(scene, world)
+    results = capture_views(world.client, cfg)
+    if owns_world:
+        world.close()
+    else:
+        world.clear()
     return results
 
 
-def save_views(images: Mapping[str, np.ndarray], output_dir: pathlib.Path) -> None:
+IMAGE_FORMATS = ("png", "webp", "npy")
+VIEWS_MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ImageEncoding:
+    """How RGB views are stored; depth and segmentation buffers are always ``.npy``.
+
+    ``png_compression`` is the zlib level (PIL's default is 6). ``webp_method``
+    trades encode time for size (0 = fastest, 6 = smallest); WebP is always lossless.
+    """
+
+    format: str = "png"
+    png_compression: int = 6
+    webp_method: int = 4
+
+    def __post_init__(self) -> None:
+        if self.format not in IMAGE_FORMATS:
+            raise ValueError(f"image format must be one of {', '.join(IMAGE_FORMATS)}")
+
+    def filename(self, view: str, array: np.ndarray) -> str:
+        if array.dtype != np.uint8 or self.format == "npy":
+            return f"{view}.npy"
+        return f"{view}.{self.format}"
+
+    def encode(self, array: np.ndarray) -> bytes:
+        buffer = io.BytesIO()
+        if array.dtype != np.uint8 or self.format == "npy":
+            # Depth and segmentation buffers keep their full precision.
+            np.save(buffer, array)
+        elif self.format == "png":
+            Image.fromarray(array).save(buffer, format="PNG", compress_level=self.png_compression)
+        else:
+            Image.fromarray(array).save(buffer, format="WEBP", lossless=True, method=self.webp_method)
+        return buffer.getvalue()
+
+
+def decode_image(data: bytes, filename: str) -> np.ndarray:
+    if filename.endswith(".npy"):
+        return np.load(io.BytesIO(data))
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def _views_manifest(images: Mapping[str, np.ndarray], encoding: ImageEncoding) -> bytes:
+    files = {view: encoding.filename(view, array) for view, array in images.items()}
+    return json.dumps({"encoding": asdict(encoding), "views": files}, indent=2).encode()
+
+
+def _write_view(path: pathlib.Path, array: np.ndarray, encoding: ImageEncoding) -> None:
+    path.write_bytes(encoding.encode(array))
+
+
+def save_views(
+    images: Mapping[str, np.ndarray],
+    output_dir: pathlib.Path,
+    encoding: Optional[ImageEncoding] = None,
+) -> None:
+    encoding = encoding or ImageEncoding()
     output_dir.mkdir(parents=True, exist_ok=True)
-    for cam_id, array in images.items():
-        path = output_dir / f"{cam_id}.png"
-        Image.fromarray(array).save(path)
+    for view, array in images.items():
+        _write_view(output_dir / encoding.filename(view, array), array, encoding)
+    (output_dir / VIEWS_MANIFEST).write_bytes(_views_manifest(images, encoding))
+
+
+class ImageSink:
+    """Encode and write views on a thread pool so the caller can move on.
+
+    PIL and NumPy release the GIL while compressing and writing, so views of
+    one scene encode in parallel and overlap with simulating the next one.
+    """
+
+    def __init__(self, encoding: Optional[ImageEncoding] = None, workers: int = 4) -> None:
+        self.encoding = encoding or ImageEncoding()
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encode")
+
+    def __enter__(self) -> "ImageSink":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def submit(self, images: Mapping[str, np.ndarray], output_dir: pathlib.Path) -> List[Future]:
+        """Queue every view of one sample; the views manifest is written immediately."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / VIEWS_MANIFEST).write_bytes(_views_manifest(images, self.encoding))
+        return [
+            self._executor.submit(_write_view, output_dir / self.encoding.filename(view, array), array, self.encoding)
+            for view, array in images.items()
+        ]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def load_views(files: Mapping[str, bytes], prefix: str = "images/") -> Dict[str, np.ndarray]:
+    """Decode a sample's views from ``{relative path: bytes}`` (e.g. ``ShardReader.read``).
+
+    Uses the views manifest when present; older samples are decoded by extension.
+    """
+    manifest = files.get(prefix + VIEWS_MANIFEST)
+    if manifest is not None:
+        names = json.loads(manifest)["views"]
+    else:
+        names = {
+            rel[len(prefix) :].rsplit(".", 1)[0]: rel[len(prefix) :]
+            for rel in files
+            if rel.startswith(prefix) and rel.endswith((".png", ".webp", ".npy"))
+        }
+    return {view: decode_image(files[prefix + name], name) for view, name in sorted(names.items())}
+
+
+def load_sample_views(sample_dir: pathlib.Path) -> Dict[str, np.ndarray]:
+    images_dir = sample_dir / "images"
+    files = {f"images/{path.name}": path.read_bytes() for path in images_dir.iterdir() if path.is_file()}
+    return load_views(files)
 
 
 def save_camera_config(config: RenderConfig, output_dir: pathlib.Path) -> None:
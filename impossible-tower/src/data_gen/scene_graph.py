@@ -76,14 +76,17 @@ def scene_graph(scene: SceneSample) -> Dict[str, object]:
         for c in scene.contacts
     ]
 
-    adjacency: Dict[str, List[str]] = {}
+    # Keyed sets (dicts) keep first-seen order while listing each neighbour once per body.
+    neighbours: Dict[str, Dict[str, None]] = {}
     for contact in contacts:
-        adjacency.setdefault(contact["body_a"], []).append(contact["body_b"])
-        adjacency.setdefault(contact["body_b"], []).append(contact["body_a"])
+        neighbours.setdefault(contact["body_a"], {})[contact["body_b"]] = None  # type: ignore[index]
+        neighbours.setdefault(contact["body_b"], {})[contact["body_a"]] = None  # type: ignore[index]
+    adjacency = {body: list(others) for body, others in neighbours.items()}
 
     return {
         "seed": scene.seed,
         "stable": scene.stable,
+        "settle_steps": scene.settle_steps,
         "objects": objects,
         "contacts": contacts,
         "adjacency": adjacency,
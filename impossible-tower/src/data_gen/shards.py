@@ -0,0 +1,175 @@
+"""Sharded tar storage for Impossible Tower datasets.
+
+Samples are packed into ``shard_XXXXX.tar`` files holding a fixed number of
+samples each, with members named ``<sample_id>/<relative path>``. A
+``shard_index.json`` next to the shards maps every sample id to its shard and
+the byte offset/size of each file, so readers can seek straight to one sample
+or stream the shards sequentially.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import pathlib
+import tarfile
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import typer
+
+
+INDEX_NAME = "shard_index.json"
+
+app = typer.Typer(add_completion=False)
+
+
+def is_sharded(root: pathlib.Path) -> bool:
+    return (root / INDEX_NAME).is_file()
+
+
+class ShardWriter:
+    def __init__(
+        self,
+        out_dir: pathlib.Path,
+        samples_per_shard: int = 1000,
+        on_shard: Optional[Callable[[pathlib.Path], None]] = None,
+    ) -> None:
+        if samples_per_shard < 1:
+            raise ValueError("samples_per_shard must be >= 1")
+        self.out_dir = out_dir
+        self.samples_per_shard = samples_per_shard
+        self.on_shard = on_shard
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._shards: List[str] = []
+        self._samples: Dict[str, Dict[str, object]] = {}
+        self._tar: Optional[tarfile.TarFile] = None
+        self._in_shard = 0
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _open_next(self) -> tarfile.TarFile:
+        name = f"shard_{len(self._shards):05d}.tar"
+        self._shards.append(name)
+        self._in_shard = 0
+        return tarfile.open(self.out_dir / name, mode="w", format=tarfile.PAX_FORMAT)
+
+    def _finish_shard(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._tar = None
+        name = self._shards[-1]
+        # Offsets are read back from the closed archive so long-name headers are accounted for.
+        with tarfile.open(self.out_dir / name, mode="r") as tar:
+            for member in tar.getmembers():
+                sample_id, _, rel = member.name.partition("/")
+                entry = self._samples[sample_id]
+                entry["files"][rel] = [member.offset_data, member.size]  # type: ignore[index]
+        if self.on_shard is not None:
+            self.on_shard(self.out_dir / name)
+
+    def add_sample(self, sample_id: str, files: Mapping[str, bytes]) -> None:
+        if "/" in sample_id or sample_id in self._samples:
+            raise ValueError(f"invalid or duplicate sample id: {sample_id}")
+        if self._tar is None or self._in_shard >= self.samples_per_shard:
+            self._finish_shard()
+            self._tar = self._open_next()
+        self._samples[sample_id] = {"shard": self._shards[-1], "files": {}}
+        for rel in sorted(files):
+            data = files[rel]
+            info = tarfile.TarInfo(name=f"{sample_id}/{rel}")
+            info.size = len(data)
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+        self._in_shard += 1
+
+    def add_directory(self, sample_dir: pathlib.Path, sample_id: Optional[str] = None) -> None:
+        files = {
+            path.relative_to(sample_dir).as_posix(): path.read_bytes()
+            for path in sample_dir.rglob("*")
+            if path.is_file()
+        }
+        self.add_sample(sample_id or sample_dir.name, files)
+
+    def close(self) -> None:
+        self._finish_shard()
+        index = {"shards": self._shards, "samples": self._samples}
+        (self.out_dir / INDEX_NAME).write_text(json.dumps(index))
+
+
+class ShardReader:
+    def __init__(self, root: pathlib.Path) -> None:
+        self.root = root
+        index = json.loads((root / INDEX_NAME).read_text())
+        self.shards: List[str] = index["shards"]
+        self._samples: Dict[str, Dict[str, object]] = index["samples"]
+
+    @property
+    def sample_ids(self) -> List[str]:
+        return list(self._samples)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __contains__(self, sample_id: object) -> bool:
+        return sample_id in self._samples
+
+    def read_file(self, sample_id: str, rel: str) -> bytes:
+        entry = self._samples[sample_id]
+        offset, size = entry["files"][rel]  # type: ignore[index]
+        with open(self.root / str(entry["shard"]), "rb") as handle:
+            handle.seek(offset)
+            return handle.read(size)
+
+    def read(self, sample_id: str) -> Dict[str, bytes]:
+        entry = self._samples[sample_id]
+        files: Mapping[str, Tuple[int, int]] = entry["files"]  # type: ignore[assignment]
+        result: Dict[str, bytes] = {}
+        with open(self.root / str(entry["shard"]), "rb") as handle:
+            for rel, (offset, size) in sorted(files.items(), key=lambda kv: kv[1][0]):
+                handle.seek(offset)
+                result[rel] = handle.read(size)
+        return result
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+        """Stream ``(sample_id, files)`` pairs shard by shard without seeking."""
+        for shard in self.shards:
+            current: Optional[str] = None
+            files: Dict[str, bytes] = {}
+            with tarfile.open(self.root / shard, mode="r|") as tar:
+                for member in tar:
+                    sample_id, _, rel = member.name.partition("/")
+                    if current is not None and sample_id != current:
+                        yield current, files
+                        files = {}
+                    current = sample_id
+                    extracted = tar.extractfile(member)
+                    files[rel] = extracted.read() if extracted is not None else b""
+            if current is not None:
+                yield current, files
+
+
+def convert_directory(src: pathlib.Path, out: pathlib.Path, samples_per_shard: int = 1000) -> int:
+    sample_dirs = sorted(path for path in src.iterdir() if path.is_dir())
+    with ShardWriter(out, samples_per_shard=samples_per_shard) as writer:
+        for sample_dir in sample_dirs:
+            writer.add_directory(sample_dir)
+    return len(sample_dirs)
+
+
+@app.command()
+def convert(
+    src: str = typer.Option(..., help="Dataset in the per-scene directory layout"),
+    out: str = typer.Option(..., help="Directory to write shards and the shard index to"),
+    shard_size: int = typer.Option(1000, help="Samples per shard"),
+) -> None:
+    count = convert_directory(pathlib.Path(src), pathlib.Path(out), samples_per_shard=shard_size)
+    typer.echo(f"Packed {count} samples into {out}")
+
+
+if __name__ == "__main__":
+    app()
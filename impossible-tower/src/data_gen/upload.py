@@ -0,0 +1,100 @@
+"""Background upload of generated samples to Cloud Storage."""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+
+logger = logging.getLogger("impossible_tower.upload")
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+class StreamingUploader:
+    """Upload files or sample directories on a thread pool while generation continues.
+
+    ``bucket`` only needs ``bucket.blob(name).upload_from_filename(path)``, so a
+    ``google.cloud.storage.Bucket`` or a local stand-in both work. At most
+    ``max_pending`` submissions are in flight; :meth:`submit` blocks beyond that
+    so local disk usage stays bounded. Each path is removed once all of its files
+    are uploaded; paths that still fail after ``retries`` attempts are kept and
+    reported by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        bucket: Any,
+        prefix: str,
+        local_root: pathlib.Path,
+        workers: int = 8,
+        max_pending: int = 32,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.local_root = local_root
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._failures: List[Tuple[pathlib.Path, BaseException]] = []
+        self._lock = threading.Lock()
+        self.uploaded_files = 0
+
+    def __enter__(self) -> "StreamingUploader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _blob_name(self, path: pathlib.Path) -> str:
+        return f"{self.prefix}/{path.relative_to(self.local_root).as_posix()}".strip("/")
+
+    def _upload_file(self, path: pathlib.Path) -> None:
+        blob = self.bucket.blob(self._blob_name(path))
+        for attempt in range(1, self.retries + 1):
+            try:
+                blob.upload_from_filename(path.as_posix())
+                return
+            except Exception as exc:  # noqa: BLE001
+                if attempt == self.retries:
+                    raise
+                logger.warning("Upload of %s failed (attempt %d/%d): %s", path, attempt, self.retries, exc)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    def _upload(self, path: pathlib.Path) -> None:
+        try:
+            files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+            for file_path in files:
+                self._upload_file(file_path)
+            with self._lock:
+                self.uploaded_files += len(files)
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Giving up on %s: %s", path, exc)
+            with self._lock:
+                self._failures.append((path, exc))
+        finally:
+            self._slots.release()
+
+    def submit(self, path: pathlib.Path) -> None:
+        self._slots.acquire()
+        self._executor.submit(self._upload, path)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._failures:
+            paths = ", ".join(str(path) for path, _ in self._failures[:5])
+            raise UploadError(f"{len(self._failures)} upload(s) failed after {self.retries} attempts: {paths}")
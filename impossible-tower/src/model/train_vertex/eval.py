@@ -11,6 +11,8 @@ from typing import Dict, Iterable, Optional
 
 import typer
 
+from data_gen.shards import ShardReader, is_sharded
+
 
 app = typer.Typer(add_completion=False)
 
@@ -39,7 +41,15 @@ def _load_predictions(path: Optional[str]) -> Dict[str, Dict[str, object]]:
 def _compute_sample_metrics(sample_dir: pathlib.Path, prediction: Optional[Dict[str, object]]) -> SampleMetrics:
     constraints = json.loads((sample_dir / "constraints.json").read_text())
     label = json.loads((sample_dir / "label.json").read_text())
-    sample_id = sample_dir.name
+    return _metrics_from_records(sample_dir.name, constraints, label, prediction)
+
+
+def _metrics_from_records(
+    sample_id: str,
+    constraints: Dict[str, object],
+    label: Dict[str, object],
+    prediction: Optional[Dict[str, object]],
+) -> SampleMetrics:
     possible_pred = bool(prediction.get("possible", True)) if prediction else True
     com_constraints = constraints.get("com_constraints", {})
     violations = sum(1 for info in com_constraints.values() if not info.get("within_support", False))
@@ -94,9 +104,15 @@ def main(
     dataset_path = pathlib.Path(dataset_dir)
     predictions = _load_predictions(predictions_path)
     metrics = []
-    for sample_dir in sorted(dataset_path.iterdir()):
-        if sample_dir.is_dir():
-            metrics.append(_compute_sample_metrics(sample_dir, predictions.get(sample_dir.name)))
+    if is_sharded(dataset_path):
+        for sample_id, files in ShardReader(dataset_path):
+            constraints = json.loads(files["constraints.json"])
+            label = json.loads(files["label.json"])
+            metrics.append(_metrics_from_records(sample_id, constraints, label, predictions.get(sample_id)))
+    else:
+        for sample_dir in sorted(dataset_path.iterdir()):
+            if sample_dir.is_dir():
+                metrics.append(_compute_sample_metrics(sample_dir, predictions.get(sample_dir.name)))
     summary = _summarize(metrics)
     path = _write_markdown(summary, pathlib.Path(output_dir))
     typer.echo(f"Wrote evaluation summary to {path}")
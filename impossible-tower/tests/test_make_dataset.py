@@ -0,0 +1,62 @@
+import json
+
+from typer.testing import CliRunner
+
+from data_gen.make_dataset import app
+
+
+runner = CliRunner()
+
+
+def _generate(out, *extra):
+    args = ["--out", str(out), "--n-scenes", "3", "--views", "1", "--seed", "11", *extra]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+
+
+def test_parallel_generation_matches_serial(tmp_path):
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    _generate(serial_dir, "--workers", "1")
+    _generate(parallel_dir, "--workers", "2")
+
+    serial_files = sorted(p.relative_to(serial_dir) for p in serial_dir.rglob("*") if p.is_file())
+    parallel_files = sorted(p.relative_to(parallel_dir) for p in parallel_dir.rglob("*") if p.is_file())
+    assert serial_files == parallel_files
+    for rel in serial_files:
+        assert (serial_dir / rel).read_bytes() == (parallel_dir / rel).read_bytes()
+
+
+def test_rerun_skips_complete_scenes_and_repairs_corrupt_ones(tmp_path):
+    out = tmp_path / "resume"
+    runner.invoke(app, ["--out", str(out), "--n-scenes", "2", "--views", "1", "--seed", "11"])
+    (out / "scene_00001" / "label.json").write_text("corrupt")
+    result = runner.invoke(app, ["--out", str(out), "--n-scenes", "3", "--views", "1", "--seed", "11"])
+    assert result.exit_code == 0, result.output
+    assert "Skipping 1 scenes" in result.output
+    assert "[2/2] scene_00002" in result.output
+    assert (out / "scene_00001" / "label.json").read_text() != "corrupt"
+
+    changed = runner.invoke(app, ["--out", str(out), "--n-scenes", "3", "--views", "1", "--seed", "12"])
+    assert changed.exit_code != 0
+
+
+def test_fidelity_audit_reports_disagreement(tmp_path):
+    out = tmp_path / "audit"
+    _generate(out, "--n-scenes", "4", "--fidelity", "fast", "--audit-frac", "1.0")
+    report = json.loads((out / "fidelity_audit.json").read_text())
+    assert report["summary"]["fidelity"] == "fast"
+    assert report["summary"]["audited"] == 4
+    assert [scene["index"] for scene in report["scenes"]] == [0, 1, 2, 3]
+
+
+def test_num_blocks_range_is_planned_per_scene(tmp_path):
+    out = tmp_path / "tall"
+    _generate(out, "--num-blocks", "5-8")
+    counts = [
+        len(json.loads((out / f"scene_{idx:05d}" / "scene_graph.json").read_text())["objects"]) for idx in range(3)
+    ]
+    assert all(5 <= count <= 8 for count in counts)
+
+    bad = runner.invoke(app, ["--out", str(tmp_path / "bad"), "--num-blocks", "8-5"])
+    assert bad.exit_code != 0
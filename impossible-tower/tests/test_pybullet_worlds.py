@@ -0,0 +1,56 @@
+from data_gen.audit import audit_scene
+from data_gen.pybullet_worlds import (
+    FIDELITY_PROFILES,
+    GROUND_NAME,
+    SettleConfig,
+    TowerWorld,
+    generate_scene,
+    generate_scene_batch,
+)
+
+
+def test_reused_world_matches_fresh_world():
+    with TowerWorld() as world:
+        reused = [generate_scene(seed=s, stable=s % 2 == 0, world=world) for s in range(3)]
+    fresh = [generate_scene(seed=s, stable=s % 2 == 0) for s in range(3)]
+    for a, b in zip(reused, fresh):
+        assert [o.position for o in a.objects] == [o.position for o in b.objects]
+        assert a.contacts == b.contacts
+
+
+def test_adaptive_settle_stops_early_and_records_steps():
+    fixed = generate_scene(seed=2, stable=True)
+    adaptive = generate_scene(seed=2, stable=True, settle=SettleConfig())
+    assert fixed.settle_steps == 480
+    assert adaptive.settle_steps < fixed.settle_steps
+    for a, b in zip(fixed.objects, adaptive.objects):
+        assert abs(a.position[2] - b.position[2]) < 1e-3
+
+
+def test_contacts_include_ground_and_point_supporters_up():
+    scene = generate_scene(seed=0, stable=True)
+    pairs = {(c["body_a"], c["body_b"]) for c in scene.contacts}
+    assert ("block_0", GROUND_NAME) in pairs
+    assert ("block_1", "block_0") in pairs
+    assert all(c["normal"][2] > 0.5 for c in scene.contacts)
+
+
+def test_batch_towers_match_solo_scenes():
+    seeds = [3, 4, 5]
+    batch = generate_scene_batch(seeds, stables=[True, True, True])
+    for seed, sample in zip(seeds, batch):
+        solo = generate_scene(seed=seed, stable=True)
+        assert sample.seed == seed
+        for a, b in zip(sample.objects, solo.objects):
+            assert max(abs(x - y) for x, y in zip(a.position, b.position)) < 1e-3
+        assert {(c["body_a"], c["body_b"]) for c in sample.contacts} == {
+            (c["body_a"], c["body_b"]) for c in solo.contacts
+        }
+
+
+def test_fidelity_profiles_simulate_the_same_duration():
+    fast = FIDELITY_PROFILES["fast"]
+    scene = generate_scene(seed=2, stable=True, fidelity=fast)
+    reference = generate_scene(seed=2, stable=True)
+    assert scene.settle_steps == fast.steps_for(reference.settle_steps)
+    assert audit_scene(scene)["label_mismatch"] is False
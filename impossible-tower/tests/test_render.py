@@ -0,0 +1,30 @@
+import numpy as np
+
+from data_gen.pybullet_worlds import generate_scene
+from data_gen.render import RenderConfig, render_views
+
+
+def test_inline_render_matches_offline_rerender():
+    cfg = RenderConfig(width=64, height=64, camera_poses=RenderConfig().camera_poses[:2])
+    scene = generate_scene(seed=5, stable=True, render_config=cfg)
+    assert scene.images is not None
+    rerendered = render_views(scene, cfg)
+    assert scene.images.keys() == rerendered.keys()
+    for cam_id, image in scene.images.items():
+        np.testing.assert_array_equal(image, rerendered[cam_id])
+
+
+def test_optional_depth_and_segmentation_buffers():
+    cfg = RenderConfig(
+        width=32,
+        height=32,
+        camera_poses=RenderConfig().camera_poses[:1],
+        shadows=False,
+        save_depth=True,
+        save_segmentation=True,
+    )
+    images = generate_scene(seed=5, stable=True, render_config=cfg).images
+    assert set(images) == {"cam_00", "cam_00_depth", "cam_00_seg"}
+    assert images["cam_00_depth"].dtype == np.float32
+    assert images["cam_00_depth"].max() <= cfg.far + 1e-3
+    assert images["cam_00_seg"].dtype == np.int32
@@ -0,0 +1,21 @@
+from data_gen.shards import ShardReader, convert_directory
+
+
+def test_convert_directory_roundtrip(tmp_path):
+    src = tmp_path / "dataset"
+    for idx in range(5):
+        sample = src / f"scene_{idx:05d}"
+        (sample / "images").mkdir(parents=True)
+        (sample / "label.json").write_text(f'{{"possible": {str(idx % 2 == 0).lower()}}}')
+        (sample / "images" / "cam_00.png").write_bytes(bytes([idx]) * (700 + idx))
+
+    assert convert_directory(src, tmp_path / "shards", samples_per_shard=2) == 5
+    reader = ShardReader(tmp_path / "shards")
+    assert len(reader.shards) == 3
+    assert reader.read_file("scene_00003", "images/cam_00.png") == bytes([3]) * 703
+
+    streamed = dict(iter(reader))
+    assert list(streamed) == [f"scene_{idx:05d}" for idx in range(5)]
+    for sample_id, files in streamed.items():
+        assert files == reader.read(sample_id)
+        assert files["label.json"] == (src / sample_id / "label.json").read_bytes()
@@ -0,0 +1,63 @@
+import pathlib
+
+import pytest
+
+from data_gen.upload import StreamingUploader, UploadError
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_filename(self, filename):
+        self.bucket.attempts[self.name] = self.bucket.attempts.get(self.name, 0) + 1
+        if self.bucket.attempts[self.name] <= self.bucket.failures.get(self.name, 0):
+            raise ConnectionError("transient")
+        dest = self.bucket.root / self.name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(pathlib.Path(filename).read_bytes())
+
+
+class FakeBucket:
+    """Local stand-in for google.cloud.storage.Bucket."""
+
+    def __init__(self, root, failures=None):
+        self.root = root
+        self.failures = failures or {}
+        self.attempts = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+def _make_sample(root, name):
+    sample = root / name
+    (sample / "images").mkdir(parents=True)
+    (sample / "label.json").write_text("{}")
+    (sample / "images" / "cam_00.png").write_bytes(b"png")
+    return sample
+
+
+def test_uploader_retries_and_removes_local_copies(tmp_path):
+    local = tmp_path / "local"
+    bucket = FakeBucket(tmp_path / "gcs", failures={"run/scene_00001/label.json": 2})
+    with StreamingUploader(bucket, "run", local, workers=2, max_pending=1, retry_delay=0.0) as uploader:
+        for idx in range(3):
+            uploader.submit(_make_sample(local, f"scene_{idx:05d}"))
+
+    assert uploader.uploaded_files == 6
+    assert bucket.attempts["run/scene_00001/label.json"] == 3
+    assert (tmp_path / "gcs" / "run" / "scene_00002" / "images" / "cam_00.png").read_bytes() == b"png"
+    assert not any(local.iterdir())
+
+
+def test_uploader_reports_exhausted_retries(tmp_path):
+    local = tmp_path / "local"
+    bucket = FakeBucket(tmp_path / "gcs", failures={"run/scene_00000/label.json": 5})
+    uploader = StreamingUploader(bucket, "run", local, retries=2, retry_delay=0.0)
+    sample = _make_sample(local, "scene_00000")
+    uploader.submit(sample)
+    with pytest.raises(UploadError):
+        uploader.close()
+    assert sample.exists()